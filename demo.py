@@ -7,26 +7,46 @@ Decision Tree Generation pipeline with rich visual output and multiple
 execution modes.
 """
 
+from __future__ import annotations
+
+import contextlib
+import functools
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, TYPE_CHECKING
 
 import typer
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
 
-from src.demo.orchestrator import DemoOrchestrator
-from src.demo.presenter import VisualPresenter
-from src.demo.tracker import ProgressTracker
+from src.demo.console import BufferedConsole
+
+# The pipeline and most of Rich are imported inside the commands that use
+# them, so `version` and `list-documents` start without loading the LLM stack
+if TYPE_CHECKING:
+    from rich.progress import Progress
+    from src.demo.orchestrator import DemoOrchestrator
+    from src.demo.presenter import VisualPresenter
+    from src.demo.tracker import ProgressTracker
 
 
 # Configuration settings
 TREE_DISPLAY_MAX_DEPTH = 10  # Maximum depth for decision tree visualization
+BATCH_MAX_WORKERS = 8  # Documents processed concurrently in batch mode
+PROGRESS_REFRESH_PER_SECOND = 4  # Cap on progress bar redraws
+LARGE_BATCH_REFRESH_PER_SECOND = 2  # Redraw cap when processing over LARGE_BATCH_SIZE documents
+LARGE_BATCH_SIZE = 100
+PLAIN_PROGRESS_INTERVAL = 10  # Status line frequency in quick/batch mode (no progress bar)
+
+# Pipeline steps, in the order DecisionTreeGenerator reports them via on_step
+PIPELINE_STEPS = ("Criteria Parsing", "Tree Structure", "Validation", "Refinement")
+PIPELINE_STEP_COUNT = len(PIPELINE_STEPS)
+
+# Version information
+VERSION_TEXT = "Prior Authorization Decision Tree Demo v1.0.0"
+VERSION_TAGLINE = "AI-Powered Clinical Workflow System"
 
 # Initialize Rich console and Typer app
-console = Console()
-presenter = VisualPresenter(console)
+console = BufferedConsole()
 app = typer.Typer(
     name="demo",
     help="Prior Authorization Decision Tree Generation Demo",
@@ -34,6 +54,26 @@ app = typer.Typer(
 )
 
 
+@functools.cache
+def _get_progress_columns() -> tuple:
+    """Build the multi-document progress bar columns once and reuse them."""
+    from rich.progress import SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
+    return (
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TimeElapsedColumn()
+    )
+
+
+@functools.cache
+def _get_presenter() -> VisualPresenter:
+    """Create the shared presenter on first use."""
+    from src.demo.presenter import VisualPresenter
+    return VisualPresenter(console)
+
+
 @app.command()
 def run(
     batch: bool = typer.Option(False, "--batch", help="Run in batch mode without interaction"),
@@ -52,6 +92,11 @@ def run(
     This demo processes pharmaceutical criteria documents through the complete
     AI pipeline, generating decision trees with rich visual output.
     """
+    from rich.progress import Progress
+    from src.demo.orchestrator import DemoOrchestrator
+    from src.demo.tracker import ProgressTracker
+    
+    presenter = _get_presenter()
     
     # Disable colors if requested
     if no_color:
@@ -67,7 +112,7 @@ def run(
         tracker = ProgressTracker()
     except Exception as e:
         presenter.show_error("Failed to initialize demo", str(e))
-        sys.exit(1)
+        raise typer.Exit(1)
     
     # Determine execution mode
     mode = "batch" if batch else "quick" if quick else "interactive"
@@ -78,19 +123,38 @@ def run(
     session = orchestrator.start_session(mode=mode)
     tracker.start_session()
     
+    # Resolve what to process up front, so these early exits happen before
+    # any processing or live display has started
+    if document:
+        console.writeln(f"[bright_blue]🔄 Processing single document: {document}[/bright_blue]")
+        
+        document_file = Path(document)
+        if not document_file.exists():
+            presenter.show_error("Document not found", document)
+            raise typer.Exit(1)
+    else:
+        document_paths = orchestrator.get_example_documents()
+        
+        if not document_paths:
+            presenter.show_error("No example documents found", "Check examples/ directory")
+            raise typer.Exit(1)
+        
+        console.writeln(f"[bright_blue]🔄 Processing {len(document_paths)} documents...[/bright_blue]")
+        
+        if not batch and not quick:
+            # Interactive mode - ask for confirmation
+            if not presenter.prompt_continue("Ready to start processing? Press Enter to continue..."):
+                console.print("[yellow]Demo cancelled by user[/yellow]")
+                raise typer.Exit(0)
+    
+    exit_code = 0
     try:
         if document:
-            # Single document mode
-            console.print(f"[bright_blue]🔄 Processing single document: {document}[/bright_blue]")
-            
-            if not Path(document).exists():
-                presenter.show_error("Document not found", document)
-                sys.exit(1)
-            
-            # Process single document with enhanced tracking
-            doc_metrics = tracker.start_document(Path(document).name)
+            # Single document mode - process with enhanced tracking
+            doc_name = document_file.name
+            doc_metrics = tracker.start_document(doc_name)
             result = _process_document_with_tracking(
-                orchestrator, tracker, document, 
+                orchestrator, tracker, document, doc_name,
                 interactive_steps and not batch and not quick,
                 show_trees and not quick
             )
@@ -104,70 +168,85 @@ def run(
                 presenter.show_step_result("Document Processing", False, result.processing_time, result.error)
         
         else:
-            # Multi-document mode
-            document_paths = orchestrator.get_example_documents()
-            
-            if not document_paths:
-                presenter.show_error("No example documents found", "Check examples/ directory")
-                sys.exit(1)
-            
-            console.print(f"[bright_blue]🔄 Processing {len(document_paths)} documents...[/bright_blue]")
-            
-            if not batch and not quick:
-                # Interactive mode - ask for confirmation
-                if not presenter.prompt_continue("Ready to start processing? Press Enter to continue..."):
-                    console.print("[yellow]Demo cancelled by user[/yellow]")
-                    sys.exit(0)
-            
-            # Process documents with enhanced tracking
+            # Multi-document mode - process documents with enhanced tracking
             results = []
+            doc_names = [Path(doc_path).name for doc_path in document_paths]
+            # Progress text for each document, plus a final one once all are done
+            descriptions = [f"Processing {doc_name}..." for doc_name in doc_names] + ["Processing complete"]
+            display_trees = show_trees and not quick
+            interactive = interactive_steps and not batch and not quick
+            
+            # Quick and batch runs skip the live progress bar and its redraw loop
+            progress = None
+            if not (quick or batch):
+                progress = Progress(
+                    *_get_progress_columns(),
+                    console=console,
+                    transient=False,
+                    auto_refresh=True,
+                    refresh_per_second=(
+                        LARGE_BATCH_REFRESH_PER_SECOND if len(document_paths) > LARGE_BATCH_SIZE
+                        else PROGRESS_REFRESH_PER_SECOND
+                    )
+                )
             
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                BarColumn(),
-                TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-                TimeElapsedColumn(),
-                console=console,
-                transient=False
-            ) as progress:
-                main_task = progress.add_task("Processing documents...", total=len(document_paths))
+            with progress or contextlib.nullcontext(), ThreadPoolExecutor(max_workers=1) as reader:
+                main_task = None
+                if progress:
+                    main_task = progress.add_task(
+                        descriptions[0],
+                        total=len(document_paths)
+                    )
                 
-                for i, doc_path in enumerate(document_paths):
-                    doc_name = Path(doc_path).name
-                    progress.update(main_task, description=f"Processing {doc_name}...")
-                    
-                    # Track document processing
-                    doc_metrics = tracker.start_document(doc_name)
-                    result = _process_document_with_tracking(
-                        orchestrator, tracker, doc_path,
-                        interactive_steps and not batch and not quick,
-                        show_trees and not quick
+                if batch:
+                    # Documents are independent and LLM-bound, so run them concurrently
+                    results = _process_documents_concurrently(
+                        orchestrator, tracker, document_paths, doc_names, progress, main_task,
+                        display_trees
                     )
-                    tracker.finish_document(result.success, result.error)
-                    results.append(result)
-                    
-                    # Show result
-                    if result.success:
-                        presenter.show_step_result(f"{result.document_name}", True, result.processing_time)
-                        if show_trees and not quick:
-                            presenter.show_decision_tree(result.decision_tree, result.document_name, max_depth=TREE_DISPLAY_MAX_DEPTH)
-                    else:
-                        presenter.show_step_result(f"{result.document_name}", False, result.processing_time, result.error)
-                    
-                    progress.update(main_task, advance=1)
-                    
-                    # Interactive pause between documents - PAUSE PROGRESS BAR
-                    if not batch and not quick and interactive_steps and i < len(document_paths) - 1:
-                        # Stop the progress bar to avoid showing misleading percentage
-                        progress.stop()
+                else:
+                    next_content = reader.submit(_read_document, document_paths[0])
+                    for i, doc_path in enumerate(document_paths):
+                        doc_name = doc_names[i]
+                        doc_content = next_content.result()
+                        
+                        # Read the next document while this one is in the LLM pipeline
+                        if i < len(document_paths) - 1:
+                            next_content = reader.submit(_read_document, document_paths[i + 1])
+                        
+                        # Track document processing
+                        doc_metrics = tracker.start_document(doc_name)
+                        result = _process_document_with_tracking(
+                            orchestrator, tracker, doc_path, doc_name,
+                            interactive,
+                            display_trees,
+                            document_content=doc_content
+                        )
+                        tracker.finish_document(result.success, result.error)
+                        results.append(result)
+                        
+                        # Show result
+                        if result.success:
+                            presenter.show_step_result(f"{result.document_name}", True, result.processing_time)
+                            if display_trees:
+                                presenter.show_decision_tree(result.decision_tree, result.document_name, max_depth=TREE_DISPLAY_MAX_DEPTH)
+                        else:
+                            presenter.show_step_result(f"{result.document_name}", False, result.processing_time, result.error)
+                        
+                        # One update per document: advance and name the next one
+                        _report_progress(progress, main_task, i + 1, len(document_paths), descriptions[i + 1])
+                        
+                        # Interactive pause between documents - PAUSE PROGRESS BAR
+                        if interactive and i < len(document_paths) - 1:
+                            # Stop the progress bar to avoid showing misleading percentage
+                            progress.stop()
                         
-                        # Clear, informative prompt
-                        remaining = len(document_paths) - i - 1
-                        presenter.prompt_continue(f"\n✅ Document {i+1}/{len(document_paths)} complete! {remaining} remaining documents to process.\n🔄 Press Enter to continue to next document...")
+                            # Clear, informative prompt
+                            remaining = len(document_paths) - i - 1
+                            presenter.prompt_continue(f"\n✅ Document {i+1}/{len(document_paths)} complete! {remaining} remaining documents to process.\n🔄 Press Enter to continue to next document...")
                         
-                        # Restart progress bar
-                        progress.start()
+                            # Restart progress bar
+                            progress.start()
         
         # Complete session and show comprehensive summary
         completed_session = orchestrator.complete_session()
@@ -183,52 +262,127 @@ def run(
         
     except KeyboardInterrupt:
         presenter.show_warning("Demo interrupted by user")
-        sys.exit(130)
+        exit_code = 130
     except Exception as e:
         presenter.show_error("Demo failed", str(e))
         if verbose:
             console.print_exception()
-        sys.exit(1)
+        exit_code = 1
+    
+    # Exit once, after the progress display has already been torn down
+    if exit_code:
+        raise typer.Exit(exit_code)
 
 
 def _process_document_with_tracking(orchestrator: DemoOrchestrator, tracker: ProgressTracker, 
-                                   document_path: str, interactive: bool, show_tree: bool):
+                                   document_path: str, document_name: str,
+                                   interactive: bool, show_tree: bool,
+                                   document_content: Optional[str] = None):
     """Process a document with detailed step tracking."""
-    steps = ["Criteria Parsing", "Tree Structure", "Validation", "Refinement"]
+    presenter = _get_presenter()
     
+    on_step = None
     if interactive:
-        for i, step in enumerate(steps):
-            presenter.show_pipeline_step(i+1, len(steps), step, Path(document_path).name)
-            with tracker.track_step(step):
-                time.sleep(0.5)  # Simulate step processing for demo
+        def on_step(step_number: int):
+            # Each step runs until the next starts; finish_document closes the last one
+            step = PIPELINE_STEPS[step_number - 1]
+            presenter.show_pipeline_step(step_number, PIPELINE_STEP_COUNT, step, document_name)
+            tracker.start_step(step)
     
-    # Actual document processing
-    result = orchestrator.process_document(document_path)
+    result = orchestrator.process_document(
+        document_path, document_name, on_step=on_step, document_content=document_content
+    )
     
     return result
 
 
+def _read_document(document_path: str) -> Optional[str]:
+    """Read a document ahead of processing; None leaves reading (and error reporting) to the orchestrator."""
+    try:
+        return Path(document_path).read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _process_documents_concurrently(orchestrator: DemoOrchestrator, tracker: ProgressTracker,
+                                    document_paths: List[str], doc_names: List[str],
+                                    progress: Optional[Progress], task_id,
+                                    show_tree: bool):
+    """Process documents on a thread pool, reporting each one as it completes.
+    
+    Results come back in input order, whatever order the documents finish in.
+    """
+    presenter = _get_presenter()
+    results = [None] * len(document_paths)
+    completed = 0
+    max_workers = min(BATCH_MAX_WORKERS, len(document_paths))
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(orchestrator.process_document, doc_path, doc_name): index
+            for index, (doc_path, doc_name) in enumerate(zip(document_paths, doc_names))
+        }
+        try:
+            for future in as_completed(futures):
+                result = future.result()
+                results[futures[future]] = result
+                completed += 1
+                
+                if result.success:
+                    presenter.show_step_result(f"{result.document_name}", True, result.processing_time)
+                    if show_tree:
+                        presenter.show_decision_tree(result.decision_tree, result.document_name, max_depth=TREE_DISPLAY_MAX_DEPTH)
+                else:
+                    presenter.show_step_result(f"{result.document_name}", False, result.processing_time, result.error)
+                
+                _report_progress(progress, task_id, completed, len(document_paths))
+        except BaseException:
+            # Ctrl-C or a failure stops the batch; documents not yet started are dropped
+            executor.shutdown(cancel_futures=True)
+            raise
+    
+    # The tracker follows one document at a time, so record the batch in one call
+    tracker.record_documents(
+        (result.document_name, result.success, result.error, result.processing_time)
+        for result in results
+    )
+    
+    return results
+
+
+def _report_progress(progress: Optional[Progress], task_id, completed: int, total: int,
+                     description: Optional[str] = None) -> None:
+    """Advance the progress bar, or print a plain status line every few documents without one."""
+    if progress is not None:
+        progress.update(task_id, advance=1, description=description)
+    elif completed % PLAIN_PROGRESS_INTERVAL == 0 or completed == total:
+        console.print(f"[dim]Processed {completed}/{total} documents[/dim]")
+
+
 @app.command()
 def list_documents():
     """List available example documents."""
+    from src.demo.orchestrator import DemoOrchestrator
+    
+    presenter = _get_presenter()
     presenter.show_banner()
     
     try:
-        orchestrator = DemoOrchestrator()
-        documents = orchestrator.get_example_documents()
+        # Listing scans the directory directly and needs no orchestrator instance
+        documents = DemoOrchestrator.get_example_document_sizes()
         
         if not documents:
             presenter.show_error("No example documents found", "Check examples/ directory")
             return
         
-        console.print("[bright_blue]📋 Available Documents:[/bright_blue]\n")
-        for i, doc_path in enumerate(documents, 1):
+        console.write("[bright_blue]📋 Available Documents:[/bright_blue]\n")
+        for i, (doc_path, size) in enumerate(documents, 1):
             doc_name = Path(doc_path).name
-            if Path(doc_path).exists():
-                size = Path(doc_path).stat().st_size
-                console.print(f"  {i}. [green]{doc_name}[/green] ({size:,} bytes)")
+            if size is None:
+                console.write(f"  {i}. [red]{doc_name}[/red] (not found)")
             else:
-                console.print(f"  {i}. [red]{doc_name}[/red] (not found)")
+                console.write(f"  {i}. [green]{doc_name}[/green] ({size:,} bytes)")
+        console.writeln()
     except Exception as e:
         presenter.show_error("Failed to list documents", str(e))
 
@@ -236,9 +390,14 @@ def list_documents():
 @app.command()
 def version():
     """Show version information."""
-    console.print("[bright_blue]Prior Authorization Decision Tree Demo v1.0.0[/bright_blue]")
-    console.print("[cyan]AI-Powered Clinical Workflow System[/cyan]")
+    console.print(f"[bright_blue]{VERSION_TEXT}[/bright_blue]")
+    console.print(f"[cyan]{VERSION_TAGLINE}[/cyan]")
 
 
 if __name__ == "__main__":
+    # Answer a bare `version` directly instead of going through Typer/Click parsing
+    if sys.argv[1:] == ["version"]:
+        print(VERSION_TEXT)
+        print(VERSION_TAGLINE)
+        sys.exit(0)
     app()
\ No newline at end of file
@@ -8,41 +8,66 @@ An improved version of the demo with:
 3. Enhanced visual elements and interactive features
 """
 
+from __future__ import annotations
+
+import os
+import re
 import sys
 import time
 import json
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple, TYPE_CHECKING
+from dataclasses import dataclass
 from datetime import datetime
 
+# orjson is an optional, faster decoder for large tree payloads
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TimeElapsedColumn
-from rich.live import Live
-from rich.layout import Layout
 from rich.panel import Panel
+from rich.style import Style
 from rich.text import Text
-from rich.tree import Tree
-from rich.table import Table
-from rich.columns import Columns
-from rich.align import Align
-from rich.rule import Rule
-
-from src.demo.orchestrator import DemoOrchestrator
-from src.demo.presenter import VisualPresenter
-from src.demo.tracker import ProgressTracker
-from src.demo.enhanced_visualizer import (
-    RealTimeLayoutManager, 
-    UnicodeTreeRenderer, 
-    AgentInsightRenderer,
-    create_demo_processing_steps
-)
-from src.utils.tree_traversal import SafeTreeTraverser, TraversalConfig, validate_tree_structure
+
+from src.utils.tree_traversal import SafeTreeTraverser, TraversalConfig
+
+# The orchestrator pulls in the LLM SDKs and the visualizer the rest of Rich's
+# live-display machinery, so they are imported where they are used to keep
+# `--help` and `version` fast
+if TYPE_CHECKING:
+    from rich.layout import Layout
+    from src.demo.orchestrator import DemoOrchestrator
+    from src.demo.tracker import ProgressTracker
 
 
 # Configuration settings
 TREE_DISPLAY_MAX_DEPTH = 25  # Maximum depth for decision tree visualization
 
+# Patterns used when cleaning up tree JSON returned as a string
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+JSON_ERROR_CHAR_POS_RE = re.compile(r'char (\d+)')
+
+# Confidence bars for every tenth of a point, indexed by int(confidence * 10)
+_CONFIDENCE_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
+# Node styles parsed once rather than on every rendered tree line
+_STYLE_QUESTION = Style.parse("bright_blue")
+_STYLE_OUTCOME = Style.parse("bright_green")
+_STYLE_DEFAULT = Style.parse("white")
+_STYLE_HIGHLIGHT = Style.parse("bold bright_yellow")
+_STYLE_CONNECTOR = Style.parse("dim white")
+
+
+@lru_cache(maxsize=1024)
+def _prefix_from_flags(flags: Tuple[bool, ...]) -> str:
+    """Build the indentation prefix for a node from its ancestors' is-last flags."""
+    return "".join("    " if is_last else "│   " for is_last in flags)
+
 # Initialize Rich console and Typer app
 console = Console()
 app = typer.Typer(
@@ -52,14 +77,118 @@ app = typer.Typer(
 )
 
 
+@dataclass(slots=True)
+class TreeNode:
+    """Render-time view of a decision tree node, built once per node per render."""
+    id: str
+    type: str
+    text: str
+    
+    @classmethod
+    def from_dict(cls, node: Dict[str, Any]) -> "TreeNode":
+        """Resolve a node dict's id, type and display text with the usual fallbacks."""
+        node_id = node.get("id", "unknown")
+        node_type = node.get("type", "unknown")
+        if node_type == "question":
+            text = node.get("question", "Unknown Question")
+        elif node_type == "outcome":
+            text = node.get("decision", "Unknown Outcome")
+        else:
+            text = node.get("label", node_id)
+        return cls(id=node_id, type=node_type, text=text[:50])
+
+
+def _child_ids(node: Dict[str, Any]) -> List[str]:
+    """Flatten a node's dict- or list-shaped connections into its child ids."""
+    connections = node.get("connections")
+    if isinstance(connections, dict):
+        child_ids = [
+            target.get("id") if isinstance(target, dict) else target
+            for target in connections.values()
+        ]
+    else:
+        child_ids = [conn.get("target_node_id") for conn in connections or () if isinstance(conn, dict)]
+    return [child_id for child_id in child_ids if child_id]
+
+
+def _normalize_connections(node: Dict[str, Any]) -> None:
+    """Store a node's child ids under "_child_ids" so renders skip the dict/list dispatch."""
+    node["_child_ids"] = _child_ids(node)
+
+
+# Nodes added at each step of the simulated tree build, declared once
+_SIMULATION_STAGES = (
+    (
+        {
+            "id": "root",
+            "type": "question",
+            "question": "Patient age >= 18 years?",
+            "connections": {"true": "diagnosis_check", "false": "deny_age"}
+        },
+    ),
+    (
+        {
+            "id": "diagnosis_check",
+            "type": "question",
+            "question": "ICD-10 diagnosis confirmed?",
+            "connections": {"true": "prior_auth", "false": "deny_diagnosis"}
+        },
+        {
+            "id": "deny_age",
+            "type": "outcome",
+            "decision": "DENY: Patient under 18"
+        },
+    ),
+    (
+        {
+            "id": "prior_auth",
+            "type": "question",
+            "question": "Prior authorization required?",
+            "connections": {"true": "submit_auth", "false": "approve"}
+        },
+        {
+            "id": "deny_diagnosis",
+            "type": "outcome",
+            "decision": "DENY: Diagnosis not confirmed"
+        },
+    ),
+    (
+        {
+            "id": "submit_auth",
+            "type": "outcome",
+            "decision": "APPROVE: Submit for authorization"
+        },
+        {
+            "id": "approve",
+            "type": "outcome",
+            "decision": "APPROVE: No prior auth needed"
+        },
+    ),
+)
+for _stage in _SIMULATION_STAGES:
+    for _node in _stage:
+        _normalize_connections(_node)
+del _stage, _node
+
+
 class EnhancedVisualPresenter:
     """Enhanced visual presenter with real-time tree building and agent insights."""
     
     def __init__(self, console: Console):
+        from src.demo.enhanced_visualizer import UnicodeTreeRenderer
+        
         self.console = console
         self.current_tree_state = {}
         self.agent_insights = []
         self.processing_steps = []
+        # Reused across renders; the traverser resets its state per traversal
+        self._tree_renderer = UnicodeTreeRenderer(max_depth=TREE_DISPLAY_MAX_DEPTH)
+        self._traverser = SafeTreeTraverser(TraversalConfig(
+            max_depth=30,  # Reasonable depth for decision trees
+            detect_cycles=True,
+            raise_on_cycle=False,
+            log_warnings=True
+        ))
     
     def show_enhanced_banner(self):
         """Show enhanced banner with real-time capabilities."""
@@ -83,6 +212,8 @@ class EnhancedVisualPresenter:
     
     def create_real_time_layout(self) -> Layout:
         """Create layout for real-time display."""
+        from rich.layout import Layout
+        
         layout = Layout()
         
         layout.split_column(
@@ -106,7 +237,7 @@ class EnhancedVisualPresenter:
         thinking_text.append(f"Reasoning: {reasoning}\n", style="dim white")
         
         # Confidence bar
-        confidence_bar = "█" * int(confidence * 10) + "░" * (10 - int(confidence * 10))
+        confidence_bar = _CONFIDENCE_BARS[max(0, min(10, int(confidence * 10)))]
         thinking_text.append(f"Confidence: {confidence_bar} {confidence*100:.0f}%\n", 
                            style="bright_green" if confidence > 0.7 else "bright_yellow")
         
@@ -134,8 +265,7 @@ class EnhancedVisualPresenter:
                                 if not isinstance(value, str):
                                     console.print(f"[red]Warning: Non-string connection found in node {node_id}: {key}={type(value).__name__}[/red]")
         
-        tree_renderer = UnicodeTreeRenderer(max_depth=TREE_DISPLAY_MAX_DEPTH)
-        tree_visual = tree_renderer.render_tree(tree_data, highlight_node, show_connections=True)
+        tree_visual = self._tree_renderer.render_tree(tree_data, highlight_node, show_connections=True)
         
         return Panel(
             tree_visual,
@@ -150,20 +280,22 @@ class EnhancedVisualPresenter:
         
         # Handle case where nodes is a JSON string instead of a dict
         if isinstance(nodes, str):
+            cleaned_nodes = nodes
             try:
-                import json
-                import re
-                
-                # Clean up common JSON issues from LLM responses
-                cleaned_nodes = nodes.strip()
-                
-                # Remove any control characters that might cause JSON parsing issues
-                cleaned_nodes = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', cleaned_nodes)
-                
-                # Try to fix common escape issues
-                cleaned_nodes = cleaned_nodes.replace('\\"', '"').replace("\\'", "'")
-                
-                parsed_nodes = json.loads(cleaned_nodes)
+                try:
+                    # Most payloads are already valid JSON
+                    parsed_nodes = json_loads(nodes)
+                except json.JSONDecodeError:
+                    # Clean up common JSON issues from LLM responses
+                    cleaned_nodes = nodes.strip()
+                    
+                    # Remove any control characters that might cause JSON parsing issues
+                    cleaned_nodes = CONTROL_CHARS_RE.sub('', cleaned_nodes)
+                    
+                    # Try to fix common escape issues
+                    cleaned_nodes = cleaned_nodes.replace('\\"', '"').replace("\\'", "'")
+                    
+                    parsed_nodes = json_loads(cleaned_nodes)
                 if isinstance(parsed_nodes, dict) and 'nodes' in parsed_nodes:
                     nodes = parsed_nodes['nodes']
                 else:
@@ -175,8 +307,7 @@ class EnhancedVisualPresenter:
                 # Try to extract error position info for debugging
                 error_str = str(e)
                 if "char" in error_str and "column" in error_str:
-                    import re
-                    char_match = re.search(r'char (\d+)', error_str)
+                    char_match = JSON_ERROR_CHAR_POS_RE.search(error_str)
                     if char_match:
                         char_pos = int(char_match.group(1))
                         # Show context around the error position
@@ -189,150 +320,148 @@ class EnhancedVisualPresenter:
                 tree_text.append("\n📝 Check the refinement agent's data handling for double JSON encoding.", style="dim cyan")
                 return tree_text
         
+        # An empty tree (e.g. the first frame of a progressive build) needs
+        # none of the indexing, validation or traversal below
         if not nodes:
-            tree_text.append("🌱 No nodes yet...", style="dim italic")
-            return tree_text
+            return Text("🌱 No nodes yet...", style="dim italic")
         
         # Ensure nodes is a dictionary before calling .values()
         if not isinstance(nodes, dict):
             tree_text.append("🚨 Invalid nodes format - expected dictionary", style="red")
             return tree_text
         
-        # Validate tree structure before rendering
-        is_valid, issues = validate_tree_structure(nodes)
-        if not is_valid:
-            tree_text.append("⚠️  Tree structure issues detected:\n", style="yellow")
-            for issue in issues[:3]:  # Show first 3 issues
-                tree_text.append(f"  • {issue}\n", style="dim yellow")
-            if len(issues) > 3:
-                tree_text.append(f"  • ... and {len(issues) - 3} more issues\n", style="dim yellow")
-        
-        # Create safe traverser
-        config = TraversalConfig(
-            max_depth=30,  # Reasonable depth for decision trees
-            detect_cycles=True,
-            raise_on_cycle=False,
-            log_warnings=True
-        )
-        traverser = SafeTreeTraverser(config)
-        
-        # Find root nodes
-        from src.utils.tree_traversal import find_root_nodes
-        root_nodes = find_root_nodes(nodes)
+        traverser = self._traverser
+        
+        # Single pass over the node dict: normalize each node's connections
+        # to target ids, resolve them into a children index and collect the
+        # ids referenced as children so the roots fall out without another walk
+        issues = []
+        referenced_ids = set()
+        connection_targets = {}
+        children_index = {}
+        tree_nodes = {}
+        for node_id, node in nodes.items():
+            if not isinstance(node, dict):
+                issues.append(f"Node {node_id} is not a dictionary")
+                continue
+            target_ids = node.get("_child_ids")
+            if target_ids is None:
+                target_ids = _child_ids(node)
+            referenced_ids.update(target_id for target_id in target_ids if isinstance(target_id, str))
+            
+            key = node.get("id", node_id)
+            connection_targets[key] = target_ids
+            tree_nodes[key] = TreeNode.from_dict(node)
+            children_index[key] = [
+                nodes[target_id] for target_id in target_ids
+                if isinstance(target_id, str) and isinstance(nodes.get(target_id), dict)
+            ]
+        
+        root_nodes = [
+            node for node_id, node in nodes.items()
+            if node_id not in referenced_ids and isinstance(node, dict)
+        ]
+        if not root_nodes:
+            root_nodes = [node for node in nodes.values() if isinstance(node, dict)][:1]
+        
+        # Collect (text, style) segments and assemble them into the Text once
+        segments = []
+        checked_ids = set()
+        
+        def check_node(node, all_nodes):
+            """Record structural issues for a node the first time it is rendered."""
+            node_id = node.get("id")
+            if node_id in checked_ids:
+                return
+            checked_ids.add(node_id)
+            
+            if not node_id:
+                issues.append("Node without an 'id' field")
+            if not node.get("type"):
+                issues.append(f"Node {node_id} is missing a 'type' field")
+            
+            for target_id in connection_targets.get(node_id, ()):
+                if target_id == node_id:
+                    issues.append(f"Node {node_id} has self-reference")
+                elif target_id and target_id not in all_nodes:
+                    issues.append(f"Node {node_id} references non-existent node {target_id}")
         
         # Use safe traversal for each root
         for i, root in enumerate(root_nodes):
             try:
+                # Children are laid out from their parent's context, which the
+                # traverser does not pass to get_children, so remember it here
+                node_contexts = {}
+                
                 # Define processing function
                 def process_node(node, context, depth):
-                    prefix = context.get('prefix', '')
+                    node_contexts[node.get('id')] = context
+                    check_node(node, nodes)
+                    prefix = _prefix_from_flags(context.get('ancestor_flags', ()))
                     is_last = context.get('is_last', True)
-                    self._render_node_safe(tree_text, node, prefix, is_last, highlight_node)
+                    tree_node = tree_nodes.get(node.get('id')) or TreeNode.from_dict(node)
+                    self._render_node_safe(segments, tree_node, prefix, is_last, highlight_node)
                     return None
                 
                 # Define children getter
                 def get_children(node, all_nodes):
-                    children = []
-                    connections = node.get("connections", {})
-                    
-                    if isinstance(connections, dict):
-                        child_ids = list(connections.values())
-                    else:
-                        child_ids = [conn.get("target_node_id") for conn in connections if conn.get("target_node_id")]
-                    
-                    valid_children = []
-                    for child_id in child_ids:
-                        if child_id in all_nodes:
-                            valid_children.append(all_nodes[child_id])
-                    
-                    # Create context for each child
-                    result = []
-                    for idx, child in enumerate(valid_children):
-                        is_last_child = idx == len(valid_children) - 1
-                        child_prefix = prefix + ("    " if is_last else "│   ")
-                        child_context = {
-                            'prefix': child_prefix,
-                            'is_last': is_last_child
-                        }
-                        result.append((child, child_context))
-                    
-                    return result
+                    context = node_contexts.get(node.get('id'), {})
+                    child_flags = context.get('ancestor_flags', ()) + (context.get('is_last', True),)
+                    children = children_index.get(node.get('id'), [])
+                    last_idx = len(children) - 1
+                    return [
+                        (child, {'ancestor_flags': child_flags, 'is_last': idx == last_idx})
+                        for idx, child in enumerate(children)
+                    ]
                 
                 # Initial context
-                initial_context = {'prefix': '', 'is_last': i == len(root_nodes) - 1}
+                initial_context = {'ancestor_flags': (), 'is_last': i == len(root_nodes) - 1}
                 
                 # Perform safe traversal
                 traverser.traverse_tree(root, nodes, process_node, get_children, initial_context)
                 
                 if traverser.has_cycle():
-                    tree_text.append("\n⚠️  Circular references were detected and safely handled\n", style="dim yellow")
+                    issues.append(f"Circular reference detected starting from node {root.get('id', 'unknown')}")
+                    segments.append(("\n⚠️  Circular references were detected and safely handled\n", "dim yellow"))
                     
             except Exception as e:
-                tree_text.append(f"\n❌ Error rendering tree: {str(e)}\n", style="red")
+                segments.append((f"\n❌ Error rendering tree: {str(e)}\n", "red"))
+        
+        # Issues were gathered during the render pass; show them above the tree
+        if issues:
+            tree_text.append("⚠️  Tree structure issues detected:\n", style="yellow")
+            # Show first 3 issues
+            tree_text.append("  • " + "\n  • ".join(issues[:3]) + "\n", style="dim yellow")
+            if len(issues) > 3:
+                tree_text.append(f"  • ... and {len(issues) - 3} more issues\n", style="dim yellow")
         
+        tree_text.append_text(Text.assemble(*segments))
         return tree_text
     
-    def _render_node_safe(self, tree_text: Text, node: Dict[str, Any], prefix: str, is_last: bool, highlight_node: str = None):
-        """Safely render a single node without recursion."""
-        node_id = node.get("id", "unknown")
-        node_type = node.get("type", "unknown")
-        
+    def _render_node_safe(self, segments: List[tuple], node: TreeNode, prefix: str, is_last: bool, highlight_node: str = None):
+        """Safely render a single node without recursion, appending (text, style) segments."""
         # Choose connector
         connector = "└── " if is_last else "├── "
         
         # Style based on node type
+        node_type = node.type
         if node_type == "question":
             icon = "❓"
-            style = "bright_blue"
-            text = node.get("question", "Unknown Question")[:50]
+            style = _STYLE_QUESTION
         elif node_type == "outcome":
             icon = "🎯"
-            style = "bright_green"
-            text = node.get("decision", "Unknown Outcome")[:50]
+            style = _STYLE_OUTCOME
         else:
             icon = "⚪"
-            style = "white"
-            text = node.get("label", node_id)[:50]
+            style = _STYLE_DEFAULT
         
         # Highlight if this is the current node being processed
-        if highlight_node and node_id == highlight_node:
-            style = "bold bright_yellow"
+        if highlight_node and node.id == highlight_node:
+            style = _STYLE_HIGHLIGHT
             icon = "🔥"
         
-        tree_text.append(f"{prefix}{connector}{icon} ", style="dim white")
-        tree_text.append(f"{text}\n", style=style)
-    
-    def _add_node_to_tree(self, tree_text: Text, node: Dict[str, Any], all_nodes: Dict[str, Any], 
-                         prefix: str, is_last: bool, highlight_node: str = None):
-        """Legacy method kept for compatibility - redirects to safe traversal."""
-        # This method is kept for backward compatibility but now uses safe traversal
-        config = TraversalConfig(max_depth=30, detect_cycles=True, raise_on_cycle=False)
-        traverser = SafeTreeTraverser(config)
-        
-        def process_node(n, ctx, depth):
-            p = ctx.get('prefix', prefix)
-            last = ctx.get('is_last', is_last)
-            self._render_node_safe(tree_text, n, p, last, highlight_node)
-        
-        def get_children(n, all_n):
-            children = []
-            connections = n.get("connections", {})
-            if isinstance(connections, dict):
-                child_ids = list(connections.values())
-            else:
-                child_ids = [conn.get("target_node_id") for conn in connections if conn.get("target_node_id")]
-            
-            valid_children = [all_n[child_id] for child_id in child_ids if child_id in all_n]
-            result = []
-            for i, child in enumerate(valid_children):
-                is_last_child = i == len(valid_children) - 1
-                child_prefix = prefix + ("    " if is_last else "│   ")
-                child_context = {'prefix': child_prefix, 'is_last': is_last_child}
-                result.append((child, child_context))
-            return result
-        
-        initial_context = {'prefix': prefix, 'is_last': is_last}
-        traverser.traverse_tree(node, all_nodes, process_node, get_children, initial_context)
+        segments.append((f"{prefix}{connector}{icon} ", _STYLE_CONNECTOR))
+        segments.append((f"{node.text}\n", style))
     
     def show_step_insight(self, step_name: str, key_finding: str, impact: str, 
                          data_snippet: str = None) -> Panel:
@@ -352,24 +481,34 @@ class EnhancedVisualPresenter:
             padding=(0, 1)
         )
     
-    def animate_agent_workflow(self, document_path: str) -> None:
-        """Show animated workflow with real-time updates using enhanced visualizer."""
+    def animate_agent_workflow(self, document_path: str, doc_name: Optional[str] = None,
+                               region: Optional[Layout] = None) -> None:
+        """Show animated workflow with real-time updates using enhanced visualizer.
+        
+        Pass ``region`` to draw into a layout region of an already running Live
+        display rather than a full-screen one of its own.
+        """
+        from src.demo.enhanced_visualizer import RealTimeLayoutManager, create_demo_processing_steps
+        
         layout_manager = RealTimeLayoutManager(self.console, max_tree_depth=TREE_DISPLAY_MAX_DEPTH)
         processing_steps = create_demo_processing_steps()
         
         # Use the enhanced animation system
         layout_manager.animate_processing_sequence(
-            Path(document_path).name,
+            doc_name or Path(document_path).name,
             processing_steps,
-            simulate_tree_growth=True
+            simulate_tree_growth=True,
+            region=region
         )
         
-        # Final summary
-        self.console.print("\n")
-        self.console.print(Panel(
-            Text("🎉 Decision tree generation completed successfully!", style="bold bright_green"),
-            title="✨ Process Complete",
-            border_style="bright_green"
+        # Final summary, written in one print once the animation has finished
+        self.console.print(Group(
+            Text("\n"),
+            Panel(
+                Text("🎉 Decision tree generation completed successfully!", style="bold bright_green"),
+                title="✨ Process Complete",
+                border_style="bright_green"
+            )
         ))
     
     def _simulate_tree_building(self, tree_data: Dict[str, Any], step: int):
@@ -378,51 +517,9 @@ class EnhancedVisualPresenter:
             tree_data["nodes"] = {}
         
         # Add nodes progressively based on step
-        if step >= 1:
-            tree_data["nodes"]["root"] = {
-                "id": "root",
-                "type": "question",
-                "question": "Patient age >= 18 years?",
-                "connections": {"true": "diagnosis_check", "false": "deny_age"}
-            }
-        
-        if step >= 2:
-            tree_data["nodes"]["diagnosis_check"] = {
-                "id": "diagnosis_check", 
-                "type": "question",
-                "question": "ICD-10 diagnosis confirmed?",
-                "connections": {"true": "prior_auth", "false": "deny_diagnosis"}
-            }
-            tree_data["nodes"]["deny_age"] = {
-                "id": "deny_age",
-                "type": "outcome", 
-                "decision": "DENY: Patient under 18"
-            }
-        
-        if step >= 3:
-            tree_data["nodes"]["prior_auth"] = {
-                "id": "prior_auth",
-                "type": "question",
-                "question": "Prior authorization required?", 
-                "connections": {"true": "submit_auth", "false": "approve"}
-            }
-            tree_data["nodes"]["deny_diagnosis"] = {
-                "id": "deny_diagnosis",
-                "type": "outcome",
-                "decision": "DENY: Diagnosis not confirmed"
-            }
-        
-        if step >= 4:
-            tree_data["nodes"]["submit_auth"] = {
-                "id": "submit_auth",
-                "type": "outcome",
-                "decision": "APPROVE: Submit for authorization"
-            }
-            tree_data["nodes"]["approve"] = {
-                "id": "approve", 
-                "type": "outcome",
-                "decision": "APPROVE: No prior auth needed"
-            }
+        for stage in _SIMULATION_STAGES[:step]:
+            for node in stage:
+                tree_data["nodes"][node["id"]] = node
 
 
 @app.command()
@@ -435,7 +532,8 @@ def run(
     output_dir: str = typer.Option("outputs", "--output-dir", help="Output directory path"),
     no_color: bool = typer.Option(False, "--no-color", help="Disable colored output"),
     real_time: bool = typer.Option(True, "--real-time/--no-real-time", help="Show real-time agent visualization"),
-    animated: bool = typer.Option(True, "--animated/--static", help="Use animated displays")
+    animated: bool = typer.Option(True, "--animated/--static", help="Use animated displays"),
+    demo_pace: float = typer.Option(1.0, "--demo-pace", help="Seconds to pause on each step insight in interactive mode")
 ):
     """
     Run the Enhanced Prior Authorization Decision Tree Demo.
@@ -443,6 +541,10 @@ def run(
     Features real-time agent visualization, inline tree graphics, and enhanced UX.
     """
     
+    from src.demo.orchestrator import DemoOrchestrator
+    from src.demo.presenter import VisualPresenter
+    from src.demo.tracker import ProgressTracker
+    
     # Disable colors if requested
     if no_color:
         console._force_terminal = False
@@ -465,6 +567,7 @@ def run(
     
     # Determine execution mode
     mode = "batch" if batch else "quick" if quick else "interactive"
+    pace = 0.0 if batch or quick else demo_pace
     if mock:
         mode += "_mock"
     
@@ -477,20 +580,23 @@ def run(
             # Single document mode with enhanced visualization
             console.print(f"[bright_blue]🔄 Processing document with enhanced visualization: {document}[/bright_blue]")
             
-            if not Path(document).exists():
+            document_file = Path(document)
+            doc_name = document_file.name
+            if not document_file.exists():
                 presenter.show_error("Document not found", document)
                 sys.exit(1)
             
             # Show animated workflow if enabled
             if animated and real_time and not batch and not quick:
-                enhanced_presenter.animate_agent_workflow(document)
+                enhanced_presenter.animate_agent_workflow(document, doc_name)
             
             # Process document with enhanced tracking
-            doc_metrics = tracker.start_document(Path(document).name)
+            doc_metrics = tracker.start_document(doc_name)
             result = _process_document_with_enhanced_tracking(
-                orchestrator, tracker, enhanced_presenter, document,
+                orchestrator, tracker, enhanced_presenter, document, doc_name,
                 real_time and not batch and not quick,
-                animated and not quick
+                animated and not quick,
+                pace_seconds=pace
             )
             tracker.finish_document(result.success, result.error)
             
@@ -536,7 +642,7 @@ def run(
             orchestrator.session.total_documents = len(document_paths)
             results = []
             
-            with Progress(
+            progress = Progress(
                 SpinnerColumn(),
                 TextColumn("[progress.description]{task.description}"),
                 BarColumn(),
@@ -544,25 +650,41 @@ def run(
                 TimeElapsedColumn(),
                 console=console,
                 transient=False
-            ) as progress:
-                main_task = progress.add_task("Processing documents...", total=len(document_paths))
+            )
+            main_task = progress.add_task("Processing documents...", total=len(document_paths))
+            
+            # When animating, the progress bar and the agent animation share one
+            # Live display instead of stopping the progress for every document
+            show_animation = animated and real_time and not batch and not quick
+            if show_animation:
+                from rich.layout import Layout
+                from rich.live import Live
                 
+                display = Layout()
+                display.split_column(
+                    Layout(progress, name="progress", size=1),
+                    Layout(name="animation")
+                )
+                live = Live(display, console=console, refresh_per_second=4)
+            else:
+                live = progress
+            
+            with live:
                 for i, doc_path in enumerate(document_paths):
                     doc_name = Path(doc_path).name
                     progress.update(main_task, description=f"🧠 Processing {doc_name}...")
                     
                     # Show animated workflow for each document if enabled
-                    if animated and real_time and not batch and not quick:
-                        progress.stop()
-                        enhanced_presenter.animate_agent_workflow(doc_path)
-                        progress.start()
+                    if show_animation:
+                        enhanced_presenter.animate_agent_workflow(doc_path, doc_name, region=display["animation"])
                     
                     # Track document processing
                     doc_metrics = tracker.start_document(doc_name)
                     result = _process_document_with_enhanced_tracking(
-                        orchestrator, tracker, enhanced_presenter, doc_path,
+                        orchestrator, tracker, enhanced_presenter, doc_path, doc_name,
                         real_time and not batch and not quick,
-                        animated and not quick
+                        animated and not quick,
+                        pace_seconds=pace
                     )
                     tracker.finish_document(result.success, result.error)
                     results.append(result)
@@ -593,13 +715,17 @@ def run(
                     
                     # Enhanced interactive pause
                     if not batch and not quick and real_time and i < len(document_paths) - 1:
-                        progress.stop()
+                        live.stop()
                         remaining = len(document_paths) - i - 1
                         presenter.prompt_continue(
                             f"\n🎉 Document {i+1}/{len(document_paths)} completed with enhanced visualization! "
                             f"{remaining} remaining.\n✨ Press Enter to continue..."
                         )
-                        progress.start()
+                        live.start()
+                
+                if show_animation:
+                    # Leave just the progress bar on screen once every document is done
+                    live.update(progress, refresh=True)
         
         # Complete session and show enhanced summary
         completed_session = orchestrator.complete_session()
@@ -615,9 +741,9 @@ def run(
         output_path = Path(output_dir)
         
         # Get actual output files
-        decision_tree_files = list((output_path / "decision_trees").glob("*.json")) if (output_path / "decision_trees").exists() else []
-        report_files = list((output_path / "reports").glob("*.json")) if (output_path / "reports").exists() else []
-        log_files = list((output_path / "logs").glob("*.log")) if (output_path / "logs").exists() else []
+        decision_tree_files = _scan_ext(output_path / "decision_trees", ".json")
+        report_files = _scan_ext(output_path / "reports", ".json")
+        log_files = _scan_ext(output_path / "logs", ".log")
         
         completion_text = Text.assemble(
             ("🎉 Enhanced Demo Completed Successfully!", "bold bright_green"),
@@ -666,9 +792,17 @@ def run(
         sys.exit(1)
 
 
+def _scan_ext(directory: Path, ext: str) -> List[os.DirEntry]:
+    """List the entries in a directory whose names end with the given extension."""
+    if not directory.is_dir():
+        return []
+    with os.scandir(directory) as entries:
+        return [entry for entry in entries if entry.name.endswith(ext)]
+
+
 def _process_document_with_enhanced_tracking(orchestrator: DemoOrchestrator, tracker: ProgressTracker,
-                                           enhanced_presenter: EnhancedVisualPresenter, document_path: str,
-                                           real_time: bool, animated: bool):
+                                           enhanced_presenter: EnhancedVisualPresenter, document_path: str, doc_name: str,
+                                           real_time: bool, animated: bool, pace_seconds: float = 0.0):
     """Process a document with enhanced step tracking and visualization."""
     steps = ["Criteria Parsing", "Tree Structure", "Validation", "Refinement"]
     
@@ -689,10 +823,11 @@ def _process_document_with_enhanced_tracking(orchestrator: DemoOrchestrator, tra
             enhanced_presenter.console.print(insight_panel)
             
             with tracker.track_step(step):
-                time.sleep(1.0)  # Simulate processing time
+                if pace_seconds:
+                    time.sleep(pace_seconds)  # Give the viewer time to read the insight
     
     # Actual document processing
-    result = orchestrator.process_document(document_path)
+    result = orchestrator.process_document(document_path, doc_name)
     
     return result
 
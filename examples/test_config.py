@@ -20,6 +20,8 @@ sys.path.append('.')
 from src.core.config import ConfigManager
 from src.core.llm_client import LlmClient
 
+ENVIRONMENTS = ("test", "development", "production")
+
 
 def main():
     print("=== Decision Tree Generation System - Configuration Demo ===\n")
@@ -45,9 +47,9 @@ def main():
         # Show all environment configurations
         print("📚 All Available Configurations:")
         print("-" * 50)
-        for env in ["test", "development", "production"]:
-            print(f"\n{env.upper()}:")
-            print(ConfigManager.get_model_info(env))
+        print("\n".join(
+            f"\n{env.upper()}:\n{ConfigManager.get_model_info(env)}" for env in ENVIRONMENTS
+        ))
             
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime, timedelta
+from typing import Optional
 from src.core.decision_tree_generator import DecisionTreeGenerator
 
 logging.basicConfig(level=logging.INFO)
@@ -17,17 +18,19 @@ def save_decision_tree(tree: dict):
     # Placeholder for saving the decision tree
     print("Decision tree saved.")
 
-def add_versioning_info(tree: dict) -> dict:
+def add_versioning_info(tree: dict, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now()
     tree["version"] = "1.0"
-    tree["created_at"] = datetime.now().isoformat()
+    tree["created_at"] = now.isoformat()
     tree["created_by"] = "system"
     return tree
 
-def add_compliance_metadata(tree: dict) -> dict:
+def add_compliance_metadata(tree: dict, now: Optional[datetime] = None) -> dict:
+    now = now or datetime.now()
     tree["compliance"] = {
         "cms_compliant": True,
         "state_regulations": ["CA", "NY", "TX"],  # example
-        "review_required_date": (datetime.now() + timedelta(days=365)).isoformat()
+        "review_required_date": (now + timedelta(days=365)).isoformat()
     }
     return tree
 
@@ -46,9 +49,11 @@ def main():
         # Generate tree
         decision_tree = generator.generate_decision_tree(ocr_text)
         
-        # Post-processing
-        decision_tree = add_versioning_info(decision_tree)
-        decision_tree = add_compliance_metadata(decision_tree)
+        # Post-processing, stamped from one instant so the creation and
+        # review dates agree
+        now = datetime.now()
+        decision_tree = add_versioning_info(decision_tree, now)
+        decision_tree = add_compliance_metadata(decision_tree, now)
         
         # Final validation
         final_validation = validate_final_tree(decision_tree)
@@ -7,12 +7,19 @@ Simplified demo showcasing multi-document processing with:
 - Jardiance single document example (processed through multi-doc pipeline)
 """
 
+import json
 import os
 import sys
 import time
 from pathlib import Path
 from typing import List, Optional
 
+# orjson is an optional, faster encoder for large unified trees
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import typer
 from rich.console import Console
 from rich.panel import Panel
@@ -36,6 +43,25 @@ app = typer.Typer(
 )
 
 
+EXAMPLES_DIR = Path("examples")
+
+
+def _example_file_names() -> set:
+    """Names of the files in the examples directory, from one directory scan."""
+    try:
+        with os.scandir(EXAMPLES_DIR) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
+def _file_exists(path: Path, example_files: set) -> bool:
+    """Check a file against the scanned example names, or stat it if it lives elsewhere."""
+    if path.parent == EXAMPLES_DIR:
+        return path.name in example_files
+    return path.exists()
+
+
 def show_multi_doc_banner():
     """Show banner for multi-document demo."""
     banner_text = Text.assemble(
@@ -89,13 +115,14 @@ def process_documents(doc_paths: List[Path], doc_name: str, verbose: bool = Fals
 
 def save_results(tree_data: dict, output_name: str, output_dir: Path):
     """Save decision tree results."""
-    import json
-    
     output_dir.mkdir(parents=True, exist_ok=True)
     output_file = output_dir / f"{output_name}_decision_tree.json"
     
-    with open(output_file, 'w') as f:
-        json.dump(tree_data, f, indent=2)
+    # Pretty-printing with the stdlib json runs in pure Python; orjson does it natively
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(tree_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        output_file.write_bytes(json.dumps(tree_data, indent=2).encode('utf-8'))
     
     console.print(f"   💾 Saved to: {output_file}")
 
@@ -105,6 +132,7 @@ def run(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Enable verbose output"),
     output_dir: str = typer.Option("outputs/multi_doc", "--output-dir", "-o", help="Output directory"),
     show_trees: bool = typer.Option(True, "--show-trees/--no-trees", help="Display decision trees"),
+    pause: bool = typer.Option(False, "--pause/--no-pause", help="Pause briefly after each example"),
 ):
     """
     Run the multi-document demo with Dupixent and Jardiance examples.
@@ -135,6 +163,7 @@ def run(
     ]
     
     console.print("[bright_blue]🔄 Processing examples through multi-document pipeline...[/bright_blue]\n")
+    example_files = _example_file_names()
     
     # Process each example
     with Progress(
@@ -142,6 +171,7 @@ def run(
         TextColumn("[progress.description]{task.description}"),
         BarColumn(),
         console=console,
+        refresh_per_second=4,
     ) as progress:
         
         main_task = progress.add_task("Processing documents...", total=len(examples))
@@ -151,16 +181,17 @@ def run(
             progress.update(main_task, description=f"Processing {example['name']}...")
             
             # Check files exist
-            missing_files = [f for f in example['files'] if not f.exists()]
+            missing_files = [f for f in example['files'] if not _file_exists(f, example_files)]
             if missing_files:
                 console.print(f"[red]❌ Missing files for {example['name']}: {missing_files}[/red]")
                 progress.advance(main_task)
                 continue
             
-            # Process documents
-            console.print(f"\n[bright_cyan]📄 {example['name']}[/bright_cyan]")
-            for file in example['files']:
-                console.print(f"   • {file}")
+            # Process documents; the header and file list go out in one print
+            # so the live progress bar is redrawn once
+            lines = [f"\n[bright_cyan]📄 {example['name']}[/bright_cyan]"]
+            lines.extend(f"   • {file}" for file in example['files'])
+            console.print("\n".join(lines))
             
             tree_data = process_documents(example['files'], example['name'], verbose)
             
@@ -173,7 +204,8 @@ def run(
                     presenter.show_decision_tree(tree_data, example['name'], max_depth=10)
             
             progress.advance(main_task)
-            time.sleep(0.5)  # Brief pause for visibility
+            if pause:
+                time.sleep(0.5)  # Brief pause for visibility
     
     # Summary
     console.print("\n[bright_green]🎉 Multi-document demo completed![/bright_green]")
@@ -205,11 +237,12 @@ def list_examples():
         }
     ]
     
+    example_files = _example_file_names()
     for i, example in enumerate(examples, 1):
         console.print(f"[bold]{i}. {example['name']}[/bold]")
         console.print(f"   [dim]{example['description']}[/dim]")
         for file in example['files']:
-            exists = Path(file).exists()
+            exists = _file_exists(Path(file), example_files)
             status = "[green]✓[/green]" if exists else "[red]✗[/red]"
             console.print(f"   {status} {file}")
         console.print()
@@ -1,116 +1,194 @@
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Callable
 from pathlib import Path
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor
 import copy
+import hashlib
+import operator
+import threading
 from src.core.schemas import DocumentSet, UnifiedDecisionTree
 from src.core.decision_tree_generator import DecisionTreeGenerator
 
+# orjson is an optional, faster way to copy large JSON-shaped trees
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Documents processed at once; each one is a latency-bound chain of LLM calls
+MAX_DOCUMENT_WORKERS = 8
+
+# Entries kept in each adapter cache before the least recently used is evicted
+DEFAULT_CACHE_SIZE = 128
+
+_RELATIONSHIP_FIELDS = operator.attrgetter('from_doc', 'to_doc', 'relationship_type')
+
 
 class MultiDocumentAdapter:
     """Adapts single-document pipeline for multi-document processing"""
     
-    def __init__(self, generator: DecisionTreeGenerator):
+    def __init__(self, generator: DecisionTreeGenerator, max_cache_size: int = DEFAULT_CACHE_SIZE):
         self.generator = generator
-        self.cache = {}
+        # Both caches are LRU-bounded so a long-lived adapter does not keep
+        # every tree it has seen; documents are processed concurrently, so
+        # they share a lock
+        self.max_cache_size = max_cache_size
+        self.cache = OrderedDict()
+        # Generated trees keyed by a hash of the document text, so identical
+        # content is only sent through the LLM pipeline once, across sets
+        self._tree_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         
-    def process_document_set(self, doc_set: DocumentSet) -> UnifiedDecisionTree:
-        """Process a document set - Phase 1: Simple merge without reference resolution"""
+    def process_document_set(self, doc_set: DocumentSet,
+                             on_stage: Optional[Callable[[str], None]] = None) -> UnifiedDecisionTree:
+        """Process a document set - Phase 1: Simple merge without reference resolution
         
-        # Step 1: Process primary document
-        primary_result = self._process_primary(doc_set)
+        on_stage, if given, is called with "primary", "supplementary" and "merge"
+        just before each stage starts. The primary and supplementary documents
+        are independent until the merge, so they are processed concurrently.
+        A set holding only its primary document reports just "primary".
+        """
+        if len(doc_set.documents) == 1:
+            return self._process_single_document(doc_set, on_stage)
         
-        # Step 2: Process supplementary documents
-        supplementary_results = self._process_supplementary_docs(doc_set)
+        workers = min(MAX_DOCUMENT_WORKERS, len(doc_set.documents))
+        with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="document-set") as executor:
+            # Read every document up front so an unreadable file fails the set
+            # before any LLM work is spent on the others
+            contents = self._load_all_contents(doc_set, executor)
+            
+            # Steps 1 and 2 fan out every document onto the pool at once;
+            # results are split by role when they are collected
+            primary_id = doc_set.primary_document_id
+            if on_stage:
+                on_stage("primary")
+            futures = {
+                primary_id: executor.submit(self._process_document, doc_set, primary_id, contents[primary_id])
+            }
+            
+            if on_stage:
+                on_stage("supplementary")
+            futures.update(
+                (doc_id, executor.submit(self._process_document, doc_set, doc_id, contents[doc_id]))
+                for doc_id in doc_set.documents if doc_id != primary_id
+            )
+            
+            primary_result = futures.pop(primary_id).result()
+            supplementary_results = {doc_id: future.result() for doc_id, future in futures.items()}
         
         # Step 3: Simple merge (no reference resolution yet)
+        if on_stage:
+            on_stage("merge")
         unified_tree = self._simple_merge(primary_result, supplementary_results, doc_set)
         
         return unified_tree
         
-    def _process_primary(self, doc_set: DocumentSet) -> dict:
-        """Process primary document through existing pipeline"""
-        primary_metadata = doc_set.documents[doc_set.primary_document_id]
-        primary_path = Path(primary_metadata.file_path)
+    def _process_single_document(self, doc_set: DocumentSet,
+                                 on_stage: Optional[Callable[[str], None]] = None) -> UnifiedDecisionTree:
+        """Fast path for a set of one document: no thread pool and nothing to merge
+        
+        The primary tree is wrapped as is, without the merge's copies and
+        supplementary bookkeeping.
+        """
+        if on_stage:
+            on_stage("primary")
+        primary_result = self._process_document(doc_set, doc_set.primary_document_id)
+        
+        return UnifiedDecisionTree(
+            tree=primary_result['decision_tree'],
+            source_documents=[doc_set.primary_document_id],
+            metadata={
+                'document_set_id': doc_set.set_id,
+                'merge_strategy': 'none',
+                'processing_metadata': doc_set.processing_metadata,
+                'relationships': []
+            },
+            extracted_references=[],
+            resolved_references_count=0
+        )
         
-        # Load document content
-        with open(primary_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    def _load_all_contents(self, doc_set: DocumentSet, executor: Executor) -> Dict[str, str]:
+        """Read every document in the set concurrently, keyed by document ID"""
+        doc_ids = list(doc_set.documents)
+        contents = executor.map(lambda doc_id: self._read_document(doc_set, doc_id), doc_ids)
+        return dict(zip(doc_ids, contents))
+        
+    def _read_document(self, doc_set: DocumentSet, doc_id: str) -> str:
+        """Load one document's text"""
+        return Path(doc_set.documents[doc_id].file_path).read_text(encoding='utf-8')
+        
+    def _process_document(self, doc_set: DocumentSet, doc_id: str,
+                          content: Optional[str] = None) -> dict:
+        """Process one document of the set, primary or supplementary, through the existing pipeline"""
+        # Load document content unless it was read ahead
+        if content is None:
+            content = self._read_document(doc_set, doc_id)
             
         # Use existing single-document pipeline
-        result = self.generator.generate_decision_tree(content)
+        result = self._generate_tree(content)
         
         # Enhance with multi-doc metadata
         if 'metadata' not in result:
             result['metadata'] = {}
         result['metadata']['document_set_id'] = doc_set.set_id
-        result['metadata']['document_role'] = 'primary'
-        result['metadata']['document_id'] = doc_set.primary_document_id
+        result['metadata']['document_role'] = (
+            'primary' if doc_id == doc_set.primary_document_id else 'supplementary'
+        )
+        result['metadata']['document_id'] = doc_id
         
         # Store the full result with parsed criteria
         enhanced_result = {
             'decision_tree': result,
             'parsed_criteria': self._extract_criteria_from_tree(result),
-            'document_id': doc_set.primary_document_id,
+            'document_id': doc_id,
             'metadata': result.get('metadata', {})
         }
         
-        # Cache the result
-        self.cache[doc_set.primary_document_id] = enhanced_result
+        self._remember(self.cache, doc_id, enhanced_result)
         
         return enhanced_result
         
-    def _process_supplementary_docs(self, doc_set: DocumentSet) -> Dict[str, dict]:
-        """Process all supplementary documents"""
-        results = {}
+    def _generate_tree(self, content: str) -> dict:
+        """Run the single-document pipeline, reusing the tree of identical content"""
+        key = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        with self._cache_lock:
+            cached = self._tree_cache.get(key)
+            if cached is not None:
+                self._tree_cache.move_to_end(key)
+        if cached is not None:
+            # Callers add per-document metadata, so each gets its own copy
+            return _copy_tree(cached)
         
-        for doc_id, metadata in doc_set.documents.items():
-            if doc_id == doc_set.primary_document_id:
-                continue
-                
-            doc_path = Path(metadata.file_path)
-            
-            # Load document content
-            with open(doc_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            result = self.generator.generate_decision_tree(content)
-            
-            # Enhance with metadata
-            if 'metadata' not in result:
-                result['metadata'] = {}
-            result['metadata']['document_set_id'] = doc_set.set_id
-            result['metadata']['document_role'] = 'supplementary'
-            result['metadata']['document_id'] = doc_id
-            
-            # Store enhanced result
-            enhanced_result = {
-                'decision_tree': result,
-                'parsed_criteria': self._extract_criteria_from_tree(result),
-                'document_id': doc_id,
-                'metadata': result.get('metadata', {})
-            }
-            
-            results[doc_id] = enhanced_result
-            self.cache[doc_id] = enhanced_result
-            
-        return results
+        result = self.generator.generate_decision_tree(content)
+        self._remember(self._tree_cache, key, _copy_tree(result))
+        return result
+        
+    def _remember(self, cache: OrderedDict, key: str, value: dict) -> None:
+        """Store a cache entry as most recently used, evicting the oldest past the size limit"""
+        with self._cache_lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_cache_size:
+                cache.popitem(last=False)
         
     def _simple_merge(self, primary_result: dict, 
                       supplementary_results: Dict[str, dict],
                       doc_set: DocumentSet) -> UnifiedDecisionTree:
         """Simple merge strategy - append supplementary criteria to primary tree"""
         
-        # Deep copy primary tree as base
-        merged_tree = copy.deepcopy(primary_result.get('decision_tree', {}))
-        
-        # Collect all criteria from supplementary documents
-        supplementary_criteria = []
-        for doc_id, result in supplementary_results.items():
-            criteria = result.get('parsed_criteria', [])
-            for criterion in criteria:
-                # Add source attribution
-                criterion_copy = copy.deepcopy(criterion)
-                criterion_copy['source_document'] = doc_id
-                supplementary_criteria.append(criterion_copy)
+        # Only top-level keys of the primary tree change, so copy that level and
+        # share the nested structure with the primary result
+        primary_tree = primary_result.get('decision_tree', {})
+        merged_tree = dict(primary_tree)
+        
+        # Collect all criteria from supplementary documents in one pass, adding
+        # source attribution; only the top level changes, so a shallow copy is
+        # enough
+        supplementary_criteria = [
+            {**criterion, 'source_document': doc_id}
+            for doc_id, result in supplementary_results.items()
+            for criterion in result.get('parsed_criteria', ())
+        ]
                     
         # Add supplementary criteria as additional nodes
         if supplementary_criteria:
@@ -124,18 +202,24 @@ class MultiDocumentAdapter:
             }
             
             # Add to the tree structure
-            if 'supplementary_sections' not in merged_tree:
-                merged_tree['supplementary_sections'] = []
-            merged_tree['supplementary_sections'].append(supplementary_section)
+            merged_tree['supplementary_sections'] = [
+                *primary_tree.get('supplementary_sections', []), supplementary_section
+            ]
             
         # Add merge metadata
-        if 'metadata' not in merged_tree:
-            merged_tree['metadata'] = {}
-            
-        merged_tree['metadata']['merge_strategy'] = 'simple_append'
-        merged_tree['metadata']['document_count'] = len(doc_set.documents)
-        merged_tree['metadata']['primary_document'] = doc_set.primary_document_id
-        merged_tree['metadata']['supplementary_documents'] = list(supplementary_results.keys())
+        merged_tree['metadata'] = {
+            **primary_tree.get('metadata', {}),
+            'merge_strategy': 'simple_append',
+            'document_count': len(doc_set.documents),
+            'primary_document': doc_set.primary_document_id,
+            'supplementary_documents': list(supplementary_results.keys())
+        }
+        
+        # Relationship summaries, read off each relationship in one pass
+        relationships = [
+            {'from_doc': from_doc, 'to_doc': to_doc, 'type': relationship_type.value}
+            for from_doc, to_doc, relationship_type in map(_RELATIONSHIP_FIELDS, doc_set.relationships)
+        ]
         
         # Create UnifiedDecisionTree
         unified_tree = UnifiedDecisionTree(
@@ -145,14 +229,7 @@ class MultiDocumentAdapter:
                 'document_set_id': doc_set.set_id,
                 'merge_strategy': 'simple_append',
                 'processing_metadata': doc_set.processing_metadata,
-                'relationships': [
-                    {
-                        'from_doc': rel.from_doc,
-                        'to_doc': rel.to_doc,
-                        'type': rel.relationship_type.value
-                    }
-                    for rel in doc_set.relationships
-                ]
+                'relationships': relationships
             },
             extracted_references=[],  # For future use
             resolved_references_count=0  # For future use
@@ -161,26 +238,56 @@ class MultiDocumentAdapter:
         return unified_tree
         
     def _extract_criteria_from_tree(self, tree: dict) -> List[dict]:
-        """Extract criteria from a decision tree structure"""
+        """Extract criteria from a decision tree structure
+        
+        Walks the tree iteratively and collects every 'criteria' list found on a
+        dict at any depth, in document order. Collected lists are not searched
+        further, so criteria are never counted twice.
+        """
         criteria = []
+        stack = [tree]
         
-        # This is a simplified extraction - in reality, we'd parse the tree structure
-        # to extract all criteria nodes
-        if isinstance(tree, dict):
-            # Look for criteria in various possible locations
-            if 'criteria' in tree:
-                criteria.extend(tree['criteria'])
-            if 'nodes' in tree:
-                for node in tree['nodes']:
-                    if isinstance(node, dict) and 'criteria' in node:
-                        criteria.extend(node['criteria'])
-            if 'decision_points' in tree:
-                for point in tree['decision_points']:
-                    if isinstance(point, dict) and 'criteria' in point:
-                        criteria.extend(point['criteria'])
+        while stack:
+            item = stack.pop()
+            if isinstance(item, dict):
+                found = item.get('criteria')
+                if isinstance(found, list):
+                    criteria.extend(found)
+                children = [
+                    value for value in item.values()
+                    if value is not found and isinstance(value, (dict, list))
+                ]
+            elif isinstance(item, list):
+                children = [value for value in item if isinstance(value, (dict, list))]
+            else:
+                continue
+            # Reversed so the next pop visits children in their original order
+            stack.extend(reversed(children))
                         
         return criteria
         
     def clear_cache(self):
-        """Clear the document processing cache"""
-        self.cache.clear()
\ No newline at end of file
+        """Clear the document processing and generated tree caches"""
+        with self._cache_lock:
+            self.cache.clear()
+            self._tree_cache.clear()
+
+
+def _copy_tree(tree: dict) -> dict:
+    """Deep copy a decision tree, round-tripping through orjson when installed
+    
+    Anything orjson would not give back unchanged (datetimes, dataclasses, str
+    or int subclasses, non-string keys) makes it raise, and the copy falls back
+    to copy.deepcopy.
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(orjson.dumps(
+                tree,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_SUBCLASS
+            ))
+        except TypeError:
+            pass
+    return copy.deepcopy(tree)
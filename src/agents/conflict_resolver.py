@@ -1,9 +1,113 @@
 """Conflict resolution strategies for decision tree conflicts."""
 
-from typing import Dict, List, Any
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional, Tuple, Type, TypeVar
+from concurrent.futures import Future, ThreadPoolExecutor
+from pydantic import BaseModel
 from src.core.exceptions import ConflictType
 from src.core.llm_client import LlmClient
 from src.core.schemas import ConflictResolution, NodeModification
+from src.utils.json_utils import sanitize_json_for_prompt
+
+# LLM calls in flight at once for one conflict type, to stay under provider rate limits
+MAX_CONFLICT_WORKERS = 5
+
+# LLM responses kept per resolver, keyed by prompt
+PROMPT_CACHE_SIZE = 512
+
+T = TypeVar('T', bound=BaseModel)
+
+# Fixed instructions, sent ahead of the per-conflict details as the system
+# instruction; every call of a batch then starts with the same bytes, which
+# the provider can serve from its prompt prefix cache
+CONTRADICTORY_PATHS_INSTRUCTIONS = """
+Analyze a contradictory path conflict in the decision tree below.
+
+Suggest how to resolve this contradiction by:
+1. Refining the conditions to be mutually exclusive
+2. Adding additional decision nodes if needed
+3. Clarifying the logic
+
+Provide specific modifications to nodes, including:
+- Which nodes need their conditions updated
+- What the new conditions should be
+- Any new nodes that need to be added
+- Connections that need to be removed or added
+
+Focus on making conditions clear and mutually exclusive.
+"""
+
+OVERLAPPING_CONDITIONS_INSTRUCTIONS = """
+Analyze overlapping conditions in a decision tree.
+
+Suggest how to refine these conditions to be:
+1. Mutually exclusive
+2. Clear and unambiguous
+3. Cover all cases without overlap
+
+Return specific rewording for each condition.
+"""
+
+
+class PromptCache:
+    """
+    LRU cache of LLM responses keyed by a hash of the prompt.
+    
+    Conflict detection often reports near-identical conflicts, which produce
+    identical prompts; those reuse the first response instead of another LLM
+    round-trip. Responses are stored as strings (structured ones as JSON), and
+    a prompt already in flight on another thread is waited for, not re-sent.
+    """
+    
+    def __init__(self, max_size: int = PROMPT_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._pending: Dict[str, Future] = {}
+        # Conflicts of one type are resolved concurrently
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(prompt: str, schema_name: str = '', system_instruction: Optional[str] = None) -> str:
+        """Hash the prompt, its system instruction and the response schema it asks for."""
+        text = f"{schema_name}\0{system_instruction or ''}\0{prompt}"
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def get_or_create(self, key: str, create: Callable[[], str]) -> str:
+        """Return the cached response for key, calling create() on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            pending = self._pending.get(key)
+            owner = pending is None
+            if owner:
+                pending = self._pending[key] = Future()
+        
+        if not owner:
+            return pending.result()
+        
+        try:
+            value = create()
+        except Exception as e:
+            # Failures are not cached; later callers try again
+            with self._lock:
+                del self._pending[key]
+            pending.set_exception(e)
+            raise
+        
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            del self._pending[key]
+        pending.set_result(value)
+        return value
+    
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 class ConflictResolver:
@@ -12,6 +116,7 @@ class ConflictResolver:
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
         self.llm = LlmClient(verbose=verbose)
+        self._prompt_cache = PromptCache()
         if verbose:
             print("✅ ConflictResolver initialized")
     
@@ -97,40 +202,74 @@ class ConflictResolver:
             grouped[conflict_type].append(conflict)
         return grouped
     
+    def _generate_structured(self, prompt: str, response_schema: Type[T],
+                             system_instruction: Optional[str] = None) -> T:
+        """Structured LLM call, answered from the prompt cache when possible."""
+        key = PromptCache.make_key(prompt, response_schema.__name__, system_instruction)
+        response_json = self._prompt_cache.get_or_create(
+            key,
+            lambda: self.llm.generate_structured_json(
+                prompt=prompt,
+                response_schema=response_schema,
+                system_instruction=system_instruction
+            ).model_dump_json()
+        )
+        return response_schema.model_validate_json(response_json)
+    
+    def _generate_text(self, prompt: str, system_instruction: Optional[str] = None) -> str:
+        """Text LLM call, answered from the prompt cache when possible."""
+        key = PromptCache.make_key(prompt, system_instruction=system_instruction)
+        return self._prompt_cache.get_or_create(
+            key, lambda: self.llm.generate_text(prompt, system_instruction=system_instruction)
+        )
+    
+    def _call_for_each(self, call: Callable[[Dict], Any],
+                       conflicts: List[Dict]) -> List[Tuple[Any, Optional[Exception]]]:
+        """Run an LLM-bound call for every conflict concurrently
+        
+        Returns (result, error) pairs in conflict order, so one failed call
+        leaves only its own conflict unresolved.
+        """
+        def attempt(conflict):
+            try:
+                return call(conflict), None
+            except Exception as e:
+                return None, e
+        
+        if len(conflicts) <= 1:
+            return [attempt(conflict) for conflict in conflicts]
+        
+        workers = min(MAX_CONFLICT_WORKERS, len(conflicts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="conflict-resolver") as executor:
+            return list(executor.map(attempt, conflicts))
+    
     def _resolve_contradictory_paths(self, tree: dict, conflicts: List[Dict]) -> Dict:
-        """Resolve contradictory path conflicts using structured output."""
+        """Resolve contradictory path conflicts using structured output.
+        
+        Every conflict is described against one snapshot of the tree, taken
+        before this batch, so the LLM calls run concurrently and share an
+        identical instruction-and-tree prefix; their modifications are then
+        applied one after another in conflict order.
+        """
         resolved = []
         unresolved = []
+        system_instruction = (
+            f"{CONTRADICTORY_PATHS_INSTRUCTIONS}\nTree structure:\n{sanitize_json_for_prompt(tree)}"
+        )
         
-        for conflict in conflicts:
+        def request_resolution(conflict: Dict) -> ConflictResolution:
+            # Only the conflict itself varies between calls
+            prompt = f"Conflict: {conflict['description']}\nAffected nodes: {conflict['nodes']}"
+            
+            # Use structured output for better resolution
+            return self._generate_structured(prompt, ConflictResolution, system_instruction)
+        
+        outcomes = self._call_for_each(request_resolution, conflicts)
+        
+        for conflict, (resolution, error) in zip(conflicts, outcomes):
             try:
-                # Use structured output for better resolution
-                prompt = f"""
-                Analyze this contradictory path conflict in a decision tree:
-                
-                Conflict: {conflict['description']}
-                Affected nodes: {conflict['nodes']}
-                Tree structure: {tree}
-                
-                Suggest how to resolve this contradiction by:
-                1. Refining the conditions to be mutually exclusive
-                2. Adding additional decision nodes if needed
-                3. Clarifying the logic
-                
-                Provide specific modifications to nodes, including:
-                - Which nodes need their conditions updated
-                - What the new conditions should be
-                - Any new nodes that need to be added
-                - Connections that need to be removed or added
-                
-                Focus on making conditions clear and mutually exclusive.
-                """
-                
-                # Use structured JSON generation
-                resolution = self.llm.generate_structured_json(
-                    prompt=prompt,
-                    response_schema=ConflictResolution
-                )
+                if error is not None:
+                    raise error
                 
                 # Apply the resolution modifications
                 modified_tree = self._apply_modifications(tree, resolution)
@@ -211,6 +350,13 @@ class ConflictResolver:
         else:
             nodes_list = nodes
         
+        # Index nodes by id once so each conflict finds its node in O(1); the
+        # first node with a given id wins, as a linear scan would find it
+        id_index = {}
+        for i, node in enumerate(nodes_list):
+            if isinstance(node, dict):
+                id_index.setdefault(node.get('id'), (i, node))
+        
         for conflict in conflicts:
             try:
                 cycle_nodes = conflict.get('nodes', [])
@@ -228,26 +374,25 @@ class ConflictResolver:
                         to_node_id = cycle_nodes[0]
                     
                     # Find and remove the connection creating the cycle
-                    for i, node in enumerate(nodes_list):
-                        if node.get('id') == from_node_id:
-                            connections = node.get('connections', [])
-                            node['connections'] = [
-                                conn for conn in connections 
-                                if conn.get('to') != to_node_id
-                            ]
-                            
-                            # Update the original structure
-                            if isinstance(nodes, dict):
-                                nodes[from_node_id] = node
-                            else:
-                                nodes[i] = node
-                            
-                            resolved.append({
-                                'conflict': conflict,
-                                'resolution': f'Removed circular connection from {from_node_id} to {to_node_id}',
-                                'action': 'Broke circular dependency'
-                            })
-                            break
+                    if from_node_id in id_index:
+                        i, node = id_index[from_node_id]
+                        connections = node.get('connections', [])
+                        node['connections'] = [
+                            conn for conn in connections 
+                            if conn.get('to') != to_node_id
+                        ]
+                        
+                        # Update the original structure
+                        if isinstance(nodes, dict):
+                            nodes[from_node_id] = node
+                        else:
+                            nodes[i] = node
+                        
+                        resolved.append({
+                            'conflict': conflict,
+                            'resolution': f'Removed circular connection from {from_node_id} to {to_node_id}',
+                            'action': 'Broke circular dependency'
+                        })
                 else:
                     # No cycle nodes provided
                     unresolved.append(conflict)
@@ -269,11 +414,9 @@ class ConflictResolver:
         unresolved = []
         nodes = tree.get('nodes', [])
         
-        # Handle both dict and list formats
-        if isinstance(nodes, dict):
-            nodes_list = list(nodes.values())
-        else:
-            nodes_list = nodes
+        # Removals from every conflict are collected first and applied in a
+        # single pass over the nodes at the end
+        all_nodes_to_remove = set()
         
         for conflict in conflicts:
             try:
@@ -282,17 +425,7 @@ class ConflictResolver:
                 if len(redundant_nodes) > 1:
                     # Keep the first path, remove redundant ones
                     nodes_to_remove = set(redundant_nodes[len(redundant_nodes)//2:])
-                    
-                    # Remove redundant nodes
-                    tree['nodes'] = [n for n in nodes if n.get('id') not in nodes_to_remove]
-                    
-                    # Update connections to skip removed nodes
-                    for node in tree['nodes']:
-                        if 'connections' in node:
-                            node['connections'] = [
-                                conn for conn in node['connections']
-                                if conn.get('to') not in nodes_to_remove
-                            ]
+                    all_nodes_to_remove |= nodes_to_remove
                     
                     resolved.append({
                         'conflict': conflict,
@@ -305,6 +438,28 @@ class ConflictResolver:
                     print(f"   Failed to resolve redundant paths: {e}")
                 unresolved.append(conflict)
         
+        if all_nodes_to_remove:
+            try:
+                # Remove redundant nodes
+                remaining_nodes = [n for n in nodes if n.get('id') not in all_nodes_to_remove]
+                
+                # Update connections to skip removed nodes
+                for node in remaining_nodes:
+                    if 'connections' in node:
+                        node['connections'] = [
+                            conn for conn in node['connections']
+                            if conn.get('to') not in all_nodes_to_remove
+                        ]
+                
+                tree['nodes'] = remaining_nodes
+                
+            except Exception as e:
+                # The removals were never applied, so none of them resolved anything
+                if self.verbose:
+                    print(f"   Failed to resolve redundant paths: {e}")
+                unresolved.extend(r['conflict'] for r in resolved)
+                resolved = []
+        
         return {
             'tree': tree,
             'resolved': resolved,
@@ -316,36 +471,27 @@ class ConflictResolver:
         resolved = []
         unresolved = []
         
-        for conflict in conflicts:
-            try:
-                # Use LLM to refine overlapping conditions
-                prompt = f"""
-                Analyze these overlapping conditions in a decision tree:
-                
-                Conflict: {conflict['description']}
-                Affected nodes: {conflict['nodes']}
-                
-                Suggest how to refine these conditions to be:
-                1. Mutually exclusive
-                2. Clear and unambiguous
-                3. Cover all cases without overlap
-                
-                Return specific rewording for each condition.
-                """
-                
-                resolution = self.llm.generate_text(prompt)
-                
-                # For now, just log the resolution
-                resolved.append({
-                    'conflict': conflict,
-                    'resolution': resolution,
-                    'action': 'Refined overlapping conditions'
-                })
-                
-            except Exception as e:
+        def request_rewording(conflict: Dict) -> str:
+            # Use LLM to refine overlapping conditions
+            prompt = f"Conflict: {conflict['description']}\nAffected nodes: {conflict['nodes']}"
+            
+            return self._generate_text(prompt, OVERLAPPING_CONDITIONS_INSTRUCTIONS)
+        
+        outcomes = self._call_for_each(request_rewording, conflicts)
+        
+        for conflict, (resolution, error) in zip(conflicts, outcomes):
+            if error is not None:
                 if self.verbose:
-                    print(f"   Failed to resolve overlapping conditions: {e}")
+                    print(f"   Failed to resolve overlapping conditions: {error}")
                 unresolved.append(conflict)
+                continue
+            
+            # For now, just log the resolution
+            resolved.append({
+                'conflict': conflict,
+                'resolution': resolution,
+                'action': 'Refined overlapping conditions'
+            })
         
         return {
             'tree': tree,
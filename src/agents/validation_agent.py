@@ -1,3 +1,8 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Set, Tuple, Any, Optional
 from src.core.llm_client import LlmClient
 from src.core.schemas import LogicalConsistencyCheck, CompletenessCheck, AmbiguityCheck
@@ -6,6 +11,47 @@ from src.utils.tree_traversal import find_all_paths, detect_circular_references
 from src.utils.json_utils import sanitize_json_for_prompt
 from src.core.config import get_config
 
+class ValidationCache:
+    """
+    Small LRU cache of validation results keyed by tree content.
+    
+    Re-validating an unchanged tree (e.g. when a pipeline is rerun on the same
+    document) reuses the earlier result instead of repeating the LLM checks.
+    """
+    
+    def __init__(self, max_size: int = 5):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        # Documents may be validated concurrently in batch mode
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(tree: dict) -> str:
+        """Hash the tree content so equal trees share a cache entry."""
+        tree_json = json.dumps(tree, sort_keys=True, default=str)
+        return hashlib.sha256(tree_json.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            entry = self._entries[key]
+        # Hand out a copy so callers cannot mutate the cached result
+        return copy.deepcopy(entry)
+    
+    def put(self, key: str, result: dict) -> None:
+        entry = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class ValidationAgent:
     def __init__(self, verbose: bool = False, max_retries: int = None):
         self.verbose = verbose
@@ -13,6 +59,8 @@ class ValidationAgent:
         # Use provided max_retries or fall back to config
         self.max_retries = max_retries if max_retries is not None else self.config.validation_max_retries
         self.llm = LlmClient(verbose=verbose)
+        # Only consulted when caching is enabled in config (disabled in TEST)
+        self.cache = ValidationCache()
         if verbose:
             print("✅ ValidationAgent initialized")
         
@@ -20,6 +68,15 @@ class ValidationAgent:
         if self.verbose:
             print(f"\n🔍 Validating tree structure")
         
+        cache_key = None
+        if self.config.enable_caching:
+            cache_key = ValidationCache.make_key(tree)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                if self.verbose:
+                    print("   ♻️  Reusing cached validation results for unchanged tree")
+                return cached
+        
         validation_results = {
             "is_valid": True,
             "issues": [],
@@ -73,6 +130,9 @@ class ValidationAgent:
         
         validation_results["is_valid"] = len(validation_results["issues"]) == 0 and len(conflicts) == 0
         
+        if cache_key is not None:
+            self.cache.put(cache_key, validation_results)
+        
         return validation_results
     
     def _check_logical_consistency(self, tree: dict) -> dict:
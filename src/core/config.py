@@ -1,6 +1,7 @@
 """Configuration management for the Decision Tree Generation System."""
 
 import os
+from functools import lru_cache
 from typing import Dict, Any
 from dataclasses import dataclass
 from enum import Enum
@@ -36,6 +37,7 @@ class AppConfig:
     
     # Validation settings
     validation_max_retries: int = 1  # Retries for malformed LLM responses in validation
+    structured_json_max_retries: int = 2  # Retries with error feedback when structured output fails schema validation
     
     # Multi-document processing features
     enable_multi_document: bool = False
@@ -156,9 +158,15 @@ class ConfigManager:
             valid_envs = [e.value for e in Environment]
             raise ValueError(f"Invalid environment '{environment}'. Valid options: {valid_envs}")
         
-        model_config = cls.MODEL_CONFIGS[env_enum]
+        return cls._format_model_info(env_enum)
+    
+    @classmethod
+    @lru_cache(maxsize=len(Environment))
+    def _format_model_info(cls, environment: Environment) -> str:
+        """Format the model description for an environment; the configs are static."""
+        model_config = cls.MODEL_CONFIGS[environment]
         return (
-            f"Environment: {env_enum.value}\n"
+            f"Environment: {environment.value}\n"
             f"Primary Model: {model_config.primary_model}\n"
             f"Fallback Model: {model_config.fallback_model}\n"
             f"Description: {model_config.description}"
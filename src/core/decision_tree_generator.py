@@ -1,4 +1,4 @@
-from typing import Optional, Union, List
+from typing import Optional, Union, List, Callable
 from pathlib import Path
 from src.core.llm_client import LlmClient
 from src.agents.criteria_parser_agent import CriteriaParserAgent
@@ -9,6 +9,10 @@ from src.core.config import get_config
 from src.core.schemas import DocumentSet, UnifiedDecisionTree
 from src.utils.document_set_manager import DocumentSetManager
 
+# Stages reported to generate_from_documents' on_stage callback, in order.
+# Single-document runs skip "identify", "supplementary" and "merge".
+DOCUMENT_STAGES = ("identify", "primary", "supplementary", "merge", "finalize")
+
 class DecisionTreeGenerator:
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
@@ -28,28 +32,44 @@ class DecisionTreeGenerator:
             if self.config.enable_multi_document:
                 print("📚 Multi-document processing enabled")
         
-    def generate_decision_tree(self, ocr_text: str) -> dict:
+    def generate_decision_tree(self, ocr_text: str, on_step: Optional[Callable[[int], None]] = None) -> dict:
+        """
+        Run the four-agent pipeline on a criteria document.
+        
+        Args:
+            ocr_text: Criteria document text
+            on_step: Optional callback invoked with the step number (1-4)
+                     just before each pipeline step starts
+        """
         if self.verbose:
             print("\n🚀 Starting decision tree generation pipeline")
         
         # Step 1: Parse and structure the criteria
         if self.verbose:
             print("\n📋 Step 1: Parsing criteria...")
+        if on_step:
+            on_step(1)
         parsed_criteria = self.parser_agent.parse(ocr_text)
         
         # Step 2: Extract decision points and create initial tree
         if self.verbose:
             print("\n🌳 Step 2: Creating tree structure...")
+        if on_step:
+            on_step(2)
         initial_tree = self.structure_agent.create_tree(parsed_criteria)
         
         # Step 3: Validate logical consistency
         if self.verbose:
             print("\n✅ Step 3: Validating tree...")
+        if on_step:
+            on_step(3)
         validation_results = self.validation_agent.validate(initial_tree)
         
         # Step 4: Refine based on validation feedback
         if self.verbose:
             print("\n🔧 Step 4: Refining tree...")
+        if on_step:
+            on_step(4)
         final_tree = self.refinement_agent.refine(initial_tree, validation_results)
         
         if self.verbose:
@@ -57,12 +77,15 @@ class DecisionTreeGenerator:
         
         return final_tree
         
-    def generate_from_documents(self, document_paths: Union[str, Path, List[Union[str, Path]]]) -> Union[dict, UnifiedDecisionTree]:
+    def generate_from_documents(self, document_paths: Union[str, Path, List[Union[str, Path]]],
+                                on_stage: Optional[Callable[[str], None]] = None) -> Union[dict, UnifiedDecisionTree]:
         """
         Generate decision tree from one or more documents.
         
         Args:
             document_paths: Single document path or list of document paths
+            on_stage: Optional callback invoked with a DOCUMENT_STAGES name
+                     just before each stage starts
             
         Returns:
             For single document: dict with decision tree
@@ -77,9 +100,7 @@ class DecisionTreeGenerator:
             
         # Single document case
         if len(paths) == 1:
-            with open(paths[0], 'r', encoding='utf-8') as f:
-                content = f.read()
-            return self.generate_decision_tree(content)
+            return self._generate_from_primary(paths[0], on_stage)
             
         # Multiple documents
         if self.config.enable_multi_document:
@@ -92,18 +113,21 @@ class DecisionTreeGenerator:
                 self.multi_doc_adapter = MultiDocumentAdapter(self)
                 
             # Identify document set
+            if on_stage:
+                on_stage("identify")
             doc_set = self.document_set_manager.identify_document_set(paths)
             
             if doc_set is None:
                 if self.verbose:
                     print("⚠️  Could not identify document relationships, processing primary document only")
                 # Fall back to single document processing
-                with open(paths[0], 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return self.generate_decision_tree(content)
+                return self._generate_from_primary(paths[0], on_stage)
                 
             # Process document set
-            return self.multi_doc_adapter.process_document_set(doc_set)
+            unified_tree = self.multi_doc_adapter.process_document_set(doc_set, on_stage=on_stage)
+            if on_stage:
+                on_stage("finalize")
+            return unified_tree
             
         else:
             # Multi-document disabled, process only the first document
@@ -111,9 +135,17 @@ class DecisionTreeGenerator:
                 print("\n⚠️  Multiple documents provided but multi-document processing is disabled")
                 print("   Processing only the first document")
                 
-            with open(paths[0], 'r', encoding='utf-8') as f:
-                content = f.read()
-            return self.generate_decision_tree(content)
+            return self._generate_from_primary(paths[0], on_stage)
+    
+    def _generate_from_primary(self, path: Path, on_stage: Optional[Callable[[str], None]] = None) -> dict:
+        """Run the single-document pipeline on one file, reporting its stages."""
+        content = path.read_text(encoding='utf-8')
+        if on_stage:
+            on_stage("primary")
+        tree = self.generate_decision_tree(content)
+        if on_stage:
+            on_stage("finalize")
+        return tree
             
     def process_document_set(self, doc_set: DocumentSet) -> UnifiedDecisionTree:
         """
@@ -1,15 +1,29 @@
 import os
+import time
+import threading
+import functools
 from google import genai
 from google.genai import types
 from dotenv import load_dotenv
-from pydantic import BaseModel
-from typing import Type, TypeVar, Optional
+from pydantic import BaseModel, ValidationError
+from typing import Type, TypeVar, Optional, Iterator
 from .config import get_config, AppConfig
 
 # Define a TypeVar for Pydantic models to help with type hinting
 T = TypeVar('T', bound=BaseModel)
 
 
+@functools.cache
+def get_genai_client(api_key: str) -> genai.Client:
+    """Shared Gemini SDK client per API key.
+    
+    Every agent builds its own LlmClient, so sharing the SDK client lets all
+    of them, across documents and threads, reuse one pool of open HTTPS
+    connections instead of paying a fresh TLS handshake per client.
+    """
+    return genai.Client(api_key=api_key)
+
+
 def convert_pydantic_to_gemini_schema(pydantic_model: Type[BaseModel]) -> dict:
     """
     Convert Pydantic schema to Gemini-compatible schema by removing additionalProperties.
@@ -73,8 +87,11 @@ class LlmClient:
             self.model_name = config.model_config.primary_model
             self.fallback_model = config.model_config.fallback_model
         
-        # Initialize client
-        self.client = genai.Client(api_key=config.api_key)
+        # Initialize client, shared with every other LlmClient using this key
+        self.client = get_genai_client(config.api_key)
+        
+        # Per-thread bookkeeping so concurrent callers can share one client
+        self._call_state = threading.local()
         
         if self.verbose:
             print(f"🤖 LLM Client initialized:")
@@ -105,7 +122,6 @@ class LlmClient:
                 print(f"🔄 API Call ({method_name}) to {self.model_name}")
                 print(f"   Prompt: {prompt_preview}")
             
-            import time
             start_time = time.time()
             response = self.client.models.generate_content(model=self.model_name, **kwargs)
             elapsed = time.time() - start_time
@@ -154,33 +170,111 @@ class LlmClient:
             print(f"An error occurred during text generation: {e}")
             raise
 
+    def generate_text_stream(self, prompt: str, system_instruction: str = None) -> Iterator[str]:
+        """
+        Streams free-form text for a prompt, yielding chunks as they arrive.
+        
+        Lets callers observe first-token latency and stop consuming (closing the
+        generator) once a time budget is exceeded. The fallback model is only
+        used if the primary fails before producing its first chunk.
+        """
+        import warnings
+        
+        config = types.GenerateContentConfig(system_instruction=system_instruction)
+        try:
+            stream = iter(self.client.models.generate_content_stream(
+                model=self.model_name, contents=prompt, config=config
+            ))
+            first_chunk = next(stream, None)
+        except Exception as primary_error:
+            warnings.warn(
+                f"⚠️  PRIMARY MODEL FAILURE: {self.model_name} failed in generate_text_stream() "
+                f"with error: {str(primary_error)}. "
+                f"Falling back to {self.fallback_model}.",
+                UserWarning,
+                stacklevel=2
+            )
+            try:
+                stream = iter(self.client.models.generate_content_stream(
+                    model=self.fallback_model, contents=prompt, config=config
+                ))
+                first_chunk = next(stream, None)
+            except Exception as fallback_error:
+                print(f"An error occurred during streaming text generation: {fallback_error}")
+                raise Exception(
+                    f"Both models failed. Primary ({self.model_name}): {str(primary_error)}. "
+                    f"Fallback ({self.fallback_model}): {str(fallback_error)}"
+                ) from fallback_error
+        
+        if first_chunk is None:
+            return
+        if first_chunk.text:
+            yield first_chunk.text
+        for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
     def generate_structured_json(self, prompt: str, response_schema: Type[T], system_instruction: str = None) -> T:
         """
         Generates a JSON object that conforms to a given Pydantic schema.
         Includes fallback handling for Gemini API schema compatibility issues.
+        
+        If the model's output does not validate against the schema, the request
+        is retried up to config.structured_json_max_retries times with the
+        validation error appended to the prompt. The number of retries used by
+        the last call on this thread is available as last_structured_retries.
         """
-        try:
-            response = self._generate_with_fallback(
-                method_name="generate_structured_json",
-                contents=prompt,
-                config={
-                    "response_mime_type": "application/json",
-                    "response_schema": response_schema,
-                    "system_instruction": system_instruction
-                }
-            )
+        self._call_state.structured_retries = 0
+        max_retries = self.config.structured_json_max_retries
+        attempt_prompt = prompt
+        
+        for attempt in range(max_retries + 1):
+            try:
+                response = self._generate_with_fallback(
+                    method_name="generate_structured_json",
+                    contents=attempt_prompt,
+                    config={
+                        "response_mime_type": "application/json",
+                        "response_schema": response_schema,
+                        "system_instruction": system_instruction
+                    }
+                )
+            except Exception as e:
+                # Check if this is the additionalProperties error
+                if "additionalProperties" in str(e):
+                    print(f"🔧 Schema compatibility issue detected. Attempting fallback to JSON mode: {e}")
+                    return self._fallback_to_json_mode(prompt, response_schema, system_instruction)
+                else:
+                    print(f"An error occurred during structured JSON generation: {e}")
+                    raise
+            
+            self._call_state.structured_retries = attempt
             if response.parsed:
                 return response.parsed
-            else:
-                raise ValueError(f"Failed to generate valid JSON. Raw text: {response.text}")
-        except Exception as e:
-            # Check if this is the additionalProperties error
-            if "additionalProperties" in str(e):
-                print(f"🔧 Schema compatibility issue detected. Attempting fallback to JSON mode: {e}")
-                return self._fallback_to_json_mode(prompt, response_schema, system_instruction)
-            else:
-                print(f"An error occurred during structured JSON generation: {e}")
-                raise
+            
+            try:
+                return response_schema.model_validate_json(response.text)
+            except (ValidationError, ValueError, TypeError) as e:
+                validation_error = str(e)
+            
+            if attempt < max_retries:
+                if self.verbose:
+                    print(f"🔁 Invalid structured output, retrying with feedback ({attempt + 1}/{max_retries})")
+                attempt_prompt = (
+                    f"{prompt}\n\n"
+                    f"Your previous output had this error: {validation_error}\n"
+                    f"Fix the error and return only JSON that matches the schema."
+                )
+                time.sleep(1.0 * (attempt + 1))
+        
+        error = ValueError(f"Failed to generate valid JSON. Raw text: {response.text}")
+        print(f"An error occurred during structured JSON generation: {error}")
+        raise error
+
+    @property
+    def last_structured_retries(self) -> int:
+        """Retries used by the most recent generate_structured_json call on this thread."""
+        return getattr(self._call_state, "structured_retries", 0)
 
     def _fallback_to_json_mode(self, prompt: str, response_schema: Type[T], system_instruction: str = None) -> T:
         """
@@ -156,3 +156,7 @@ class UnifiedDecisionTree(BaseModel):
     metadata: Dict[str, Any]
     extracted_references: List[Dict] = Field(default_factory=list)  # For future use
     resolved_references_count: int = 0  # For future use
+    
+    def as_tree_dict(self) -> Dict[str, Any]:
+        """Return the decision tree in the plain dict form single documents produce."""
+        return self.tree
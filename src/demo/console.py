@@ -0,0 +1,37 @@
+"""
+Buffered console output for the demo.
+
+Kept separate from the presenter so entry points can create their console
+without importing the rest of the demo stack.
+"""
+
+from typing import Any, List
+
+from rich.console import Console
+
+
+class BufferedConsole(Console):
+    """
+    Console that collects lines with write() and emits them with writeln().
+    
+    Each Console.print call renders and flushes on its own, so output made of
+    many small fragments (e.g. one line per document) is buffered and written
+    in a single print call instead.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._line_buffer: List[Any] = []
+    
+    def write(self, renderable: Any = "") -> None:
+        """Buffer a line of output without rendering it."""
+        self._line_buffer.append(renderable)
+    
+    def writeln(self, renderable: Any = None) -> None:
+        """Append an optional final line and print everything buffered at once."""
+        if renderable is not None:
+            self._line_buffer.append(renderable)
+        if not self._line_buffer:
+            return
+        lines, self._line_buffer = self._line_buffer, []
+        super().print(*lines, sep="\n")
@@ -8,10 +8,18 @@ Provides advanced visualization capabilities for the enhanced demo including:
 - Interactive terminal layouts
 """
 
+import json
+import re
 import time
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
+# orjson is an optional, faster decoder for large tree payloads
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from rich.console import Console
 from rich.text import Text
 from rich.panel import Panel
@@ -26,6 +34,10 @@ from rich.columns import Columns
 from rich.align import Align
 
 
+# Control characters stripped from tree JSON returned as a string
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x1f\x7f-\x9f]')
+
+
 class TreeNodeStyle:
     """Styling constants for different node types."""
     
@@ -170,19 +182,16 @@ class UnicodeTreeRenderer:
         # Handle case where nodes is a JSON string instead of a dict
         if isinstance(nodes, str):
             try:
-                import json
-                import re
-                
                 # Clean up common JSON issues from LLM responses
                 cleaned_nodes = nodes.strip()
                 
                 # Remove any control characters that might cause JSON parsing issues
-                cleaned_nodes = re.sub(r'[\x00-\x1f\x7f-\x9f]', '', cleaned_nodes)
+                cleaned_nodes = CONTROL_CHARS_RE.sub('', cleaned_nodes)
                 
                 # Try to fix common escape issues
                 cleaned_nodes = cleaned_nodes.replace('\\"', '"').replace("\\'", "'")
                 
-                parsed_nodes = json.loads(cleaned_nodes)
+                parsed_nodes = json_loads(cleaned_nodes)
                 if isinstance(parsed_nodes, dict) and 'nodes' in parsed_nodes:
                     nodes = parsed_nodes['nodes']
                 else:
@@ -518,31 +527,48 @@ class RealTimeLayoutManager:
     
     def animate_processing_sequence(self, document_path: str, 
                                   steps: List[Dict[str, Any]],
-                                  simulate_tree_growth: bool = True):
-        """Animate the complete processing sequence."""
+                                  simulate_tree_growth: bool = True,
+                                  region: Optional[Layout] = None):
+        """Animate the complete processing sequence.
+        
+        When ``region`` is given, the animation is drawn into that layout region
+        of a Live display the caller is already running instead of opening a
+        full-screen Live of its own.
+        """
         
         layout = self.create_processing_layout()
+        
+        if region is not None:
+            region.update(layout)
+            self._play_processing_steps(layout, document_path, steps, simulate_tree_growth)
+            return
+        
+        # One Live display throttles redraws; steps only update layout regions in place
+        with Live(layout, console=self.console, refresh_per_second=4, screen=True):
+            self._play_processing_steps(layout, document_path, steps, simulate_tree_growth)
+    
+    def _play_processing_steps(self, layout: Layout, document_path: str,
+                               steps: List[Dict[str, Any]], simulate_tree_growth: bool):
+        """Update the layout for each step, pausing so every step stays visible."""
         tree_data = {'nodes': {}}
         
-        with Live(layout, refresh_per_second=4, screen=True) as live:
+        for i, step_info in enumerate(steps):
+            # Simulate tree growth
+            if simulate_tree_growth:
+                self._simulate_tree_growth(tree_data, i + 1)
             
-            for i, step_info in enumerate(steps):
-                # Simulate tree growth
-                if simulate_tree_growth:
-                    self._simulate_tree_growth(tree_data, i + 1)
-                
-                # Update layout with current step
-                self.update_layout_components(
-                    layout,
-                    document_path,
-                    tree_data,
-                    step_info.get('agent_info', {}),
-                    step_info.get('insights', {}),
-                    step_info.get('highlight_node')
-                )
-                
-                # Pause to show each step
-                time.sleep(step_info.get('duration', 2.0))
+            # Update layout with current step
+            self.update_layout_components(
+                layout,
+                document_path,
+                tree_data,
+                step_info.get('agent_info', {}),
+                step_info.get('insights', {}),
+                step_info.get('highlight_node')
+            )
+            
+            # Pause to show each step
+            time.sleep(step_info.get('duration', 2.0))
     
     def _simulate_tree_growth(self, tree_data: Dict[str, Any], step: int):
         """Simulate progressive tree building for demonstration."""
@@ -7,13 +7,14 @@ error handling and performance tracking.
 """
 
 import json
+import os
+import threading
 import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
-from src.core.decision_tree_generator import DecisionTreeGenerator
 from src.utils.json_utils import normalize_json_output
 from src.core.exceptions import (
     DecisionTreeGenerationError,
@@ -23,6 +24,20 @@ from src.core.exceptions import (
     RefinementError
 )
 
+# orjson is optional; it serializes large trees straight to UTF-8 bytes
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Example criteria documents processed by the multi-document demo
+EXAMPLE_DOCUMENTS = (
+    "ozempic_criteria.txt",
+    "jardiance_criteria.txt",
+    "cardioguard_criteria.txt"
+)
+
 
 @dataclass
 class DocumentResult:
@@ -74,8 +89,12 @@ class DemoOrchestrator:
         """
         self.output_dir = Path(output_dir)
         self.verbose = verbose
+        # Imported here so listing documents does not load the LLM stack
+        from src.core.decision_tree_generator import DecisionTreeGenerator
         self.generator = DecisionTreeGenerator(verbose=verbose)
         self.session: Optional[DemoSession] = None
+        # Guards session bookkeeping when documents are processed concurrently
+        self._session_lock = threading.Lock()
         
         # Create output directories
         self.output_dir.mkdir(exist_ok=True)
@@ -91,13 +110,19 @@ class DemoOrchestrator:
         )
         return self.session
 
-    def process_document(self, document_path: str, document_name: str = None) -> DocumentResult:
+    def process_document(self, document_path: str, document_name: str = None,
+                         on_step: Optional[Callable[[int], None]] = None,
+                         document_content: Optional[str] = None) -> DocumentResult:
         """
         Process a single document through the pipeline.
         
         Args:
             document_path: Path to the criteria document
             document_name: Optional display name for the document
+            on_step: Optional callback invoked with the step number as each
+                     pipeline step starts
+            document_content: Optional already-loaded document text; the file
+                              is read from document_path when omitted
             
         Returns:
             DocumentResult with processing outcomes and metrics
@@ -108,12 +133,13 @@ class DemoOrchestrator:
         start_time = time.time()
         
         try:
-            # Load document content
-            with open(document_path, 'r', encoding='utf-8') as f:
-                document_content = f.read()
+            # Load document content unless it was read ahead of time
+            if document_content is None:
+                with open(document_path, 'r', encoding='utf-8') as f:
+                    document_content = f.read()
             
             # Process through pipeline
-            decision_tree = self.generator.generate_decision_tree(document_content)
+            decision_tree = self.generator.generate_decision_tree(document_content, on_step=on_step)
             
             processing_time = time.time() - start_time
             
@@ -133,12 +159,7 @@ class DemoOrchestrator:
             # Save decision tree to file
             self._save_decision_tree(result)
             
-            # Add to session if one exists
-            if self.session:
-                self.session.document_results.append(result)
-                self.session.total_documents += 1
-                if result.success:
-                    self.session.successful_documents += 1
+            self._record_result(result)
             
             return result
             
@@ -151,10 +172,7 @@ class DemoOrchestrator:
                 error=f"File not found: {str(e)}"
             )
             
-            # Add to session if one exists
-            if self.session:
-                self.session.document_results.append(result)
-                self.session.total_documents += 1
+            self._record_result(result)
             
             return result
             
@@ -167,10 +185,7 @@ class DemoOrchestrator:
                 error=f"Pipeline error: {str(e)}"
             )
             
-            # Add to session if one exists
-            if self.session:
-                self.session.document_results.append(result)
-                self.session.total_documents += 1
+            self._record_result(result)
             
             return result
             
@@ -183,13 +198,20 @@ class DemoOrchestrator:
                 error=f"Unexpected error: {str(e)}"
             )
             
-            # Add to session if one exists
-            if self.session:
-                self.session.document_results.append(result)
-                self.session.total_documents += 1
+            self._record_result(result)
             
             return result
 
+    def _record_result(self, result: DocumentResult) -> None:
+        """Add a processed document to the session if one exists."""
+        if not self.session:
+            return
+        with self._session_lock:
+            self.session.document_results.append(result)
+            self.session.total_documents += 1
+            if result.success:
+                self.session.successful_documents += 1
+
     def process_multiple_documents(self, document_paths: List[str]) -> List[DocumentResult]:
         """
         Process multiple documents through the pipeline.
@@ -235,17 +257,35 @@ class DemoOrchestrator:
         
         return self.session
 
-    def get_example_documents(self) -> List[str]:
+    @staticmethod
+    def get_example_documents() -> List[str]:
         """Get list of available example documents."""
         examples_dir = Path("examples")
         if not examples_dir.exists():
             return []
             
-        return [
-            str(examples_dir / "ozempic_criteria.txt"),
-            str(examples_dir / "jardiance_criteria.txt"),
-            str(examples_dir / "cardioguard_criteria.txt")
-        ]
+        return [str(examples_dir / name) for name in EXAMPLE_DOCUMENTS]
+
+    @staticmethod
+    def get_example_document_sizes() -> List[Tuple[str, Optional[int]]]:
+        """
+        Get example document paths with their sizes in bytes.
+        
+        One directory scan tells which documents exist, so missing ones cost
+        no per-file syscall; the size is None for a missing document.
+        """
+        examples_dir = "examples"
+        try:
+            with os.scandir(examples_dir) as it:
+                entries = {entry.name: entry for entry in it}
+        except FileNotFoundError:
+            return []
+        
+        sizes = []
+        for name in EXAMPLE_DOCUMENTS:
+            entry = entries.get(name)
+            sizes.append((os.path.join(examples_dir, name), entry.stat().st_size if entry else None))
+        return sizes
 
     def _save_decision_tree(self, result: DocumentResult) -> None:
         """Save decision tree result to JSON file."""
@@ -274,12 +314,12 @@ class DemoOrchestrator:
         if result.metadata:
             output_data["metadata"].update(result.metadata)
         
-        # Normalize the JSON output before saving
-        normalized_data = normalize_json_output(output_data)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            # Write the normalized JSON string directly
-            f.write(normalized_data)
+        # Write UTF-8 bytes directly rather than building a str and having a
+        # text-mode file encode it again; orjson produces the bytes natively
+        if orjson is not None:
+            filepath.write_bytes(orjson.dumps(output_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        else:
+            filepath.write_bytes(normalize_json_output(output_data).encode('utf-8'))
 
     def _save_session_report(self) -> None:
         """Save comprehensive session report."""
@@ -7,7 +7,7 @@ and interactive elements for the demo script.
 
 import json
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
 from datetime import datetime
 
 from rich.console import Console
@@ -22,7 +22,10 @@ from rich.rule import Rule
 from rich.layout import Layout
 from rich.live import Live
 
-from src.demo.orchestrator import DocumentResult, DemoSession
+from src.demo.console import BufferedConsole
+
+if TYPE_CHECKING:
+    from src.demo.orchestrator import DemoSession
 
 
 class Colors:
@@ -65,7 +68,7 @@ class VisualPresenter:
         Args:
             console: Optional Rich console instance. Creates new one if None.
         """
-        self.console = console or Console()
+        self.console = console or BufferedConsole()
         self.colors = Colors()
     
     def show_banner(self) -> None:
@@ -145,15 +148,15 @@ class VisualPresenter:
             color = self.colors.ERROR
             status = "Failed"
         
-        result_text = f"{icon} {step_name}: {status}"
+        result_text = Text(f"{icon} {step_name}: {status}", style=color)
         
         if duration:
-            result_text += f" ({duration:.1f}s)"
+            result_text.append(f" ({duration:.1f}s)")
         
         if details:
-            result_text += f" - {details}"
+            result_text.append(f" - {details}")
         
-        self.console.print(f"[{color}]{result_text}[/{color}]")
+        self.console.print(result_text)
     
     def show_decision_tree(self, tree_data: Dict[str, Any], 
                           document_name: str, max_depth: int = 15) -> None:
@@ -332,7 +335,7 @@ class VisualPresenter:
                             target = conn.get("target_node_id", conn.get("target", "Next"))
                             branch.add(f"[{self.colors.MUTED}][{condition}] → {target}[/{self.colors.MUTED}]")
     
-    def show_processing_summary(self, session: DemoSession) -> None:
+    def show_processing_summary(self, session: 'DemoSession') -> None:
         """Display comprehensive processing summary."""
         if not session.document_results:
             self.console.print(f"[{self.colors.WARNING}]⚠️ No processing results available[/{self.colors.WARNING}]")
@@ -380,7 +383,7 @@ class VisualPresenter:
         
         self.console.print(table)
     
-    def show_session_metrics(self, session: DemoSession) -> None:
+    def show_session_metrics(self, session: 'DemoSession') -> None:
         """Display detailed session metrics."""
         if not session.completed_at:
             return
@@ -6,9 +6,9 @@ performance metrics throughout the demo execution.
 """
 
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterable, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta
 from contextlib import contextmanager
 
 
@@ -131,6 +131,29 @@ class ProgressTracker:
         
         return completed_doc
     
+    def record_documents(self, documents: Iterable[Tuple[str, bool, Optional[str], float]]) -> None:
+        """
+        Record several already-processed documents in one call.
+        
+        Used when documents are processed concurrently, where the one-at-a-time
+        start_document/finish_document flow does not apply.
+        
+        Args:
+            documents: (document_name, success, error, duration_seconds) tuples
+        """
+        completed_at = datetime.now()
+        self.document_history.extend(
+            DocumentMetrics(
+                document_name=name,
+                started_at=completed_at - timedelta(seconds=duration),
+                completed_at=completed_at,
+                total_duration=duration,
+                success=success,
+                error=error
+            )
+            for name, success, error, duration in documents
+        )
+    
     @contextmanager
     def track_step(self, step_name: str):
         """
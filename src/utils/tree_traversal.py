@@ -52,9 +52,7 @@ class SafeTreeTraverser:
         Returns:
             Result of tree traversal
         """
-        self._visited_nodes.clear()
-        self._current_path.clear()
-        self._cycle_detected = False
+        self.reset()
         
         return self._traverse_recursive(
             node, all_nodes, process_node, get_children, 
@@ -125,6 +123,12 @@ class SafeTreeTraverser:
             if self._current_path and self._current_path[-1] == node_id:
                 self._current_path.pop()
     
+    def reset(self) -> None:
+        """Clear traversal state so the traverser can be reused."""
+        self._visited_nodes.clear()
+        self._current_path.clear()
+        self._cycle_detected = False
+    
     def has_cycle(self) -> bool:
         """Check if a cycle was detected during traversal."""
         return self._cycle_detected
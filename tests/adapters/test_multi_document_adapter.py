@@ -5,6 +5,7 @@ from unittest.mock import Mock, MagicMock, patch
 from pathlib import Path
 import tempfile
 import shutil
+import threading
 
 from src.adapters.multi_document_adapter import MultiDocumentAdapter
 from src.core.schemas import (
@@ -99,9 +100,32 @@ class TestMultiDocumentAdapter:
         assert "guidelines_doc" in result.source_documents
         assert result.metadata["document_set_id"] == "test_set_001"
         
+    def test_process_document_set_reports_stages(self, adapter, sample_doc_set):
+        """Test that on_stage is called before each processing stage"""
+        stages = []
+        
+        adapter.process_document_set(sample_doc_set, on_stage=stages.append)
+        
+        assert stages == ["primary", "supplementary", "merge"]
+        
+    def test_documents_processed_concurrently(self, adapter, sample_doc_set, mock_generator):
+        """Test that primary and supplementary documents are generated in parallel"""
+        # Both calls must be in flight at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def side_effect(content):
+            barrier.wait()
+            return {"tree_type": "decision", "nodes": [], "criteria": []}
+            
+        mock_generator.generate_decision_tree.side_effect = side_effect
+        
+        result = adapter.process_document_set(sample_doc_set)
+        
+        assert result.source_documents == ["insurance_doc", "guidelines_doc"]
+        
     def test_process_primary_document(self, adapter, sample_doc_set):
         """Test processing of primary document"""
-        result = adapter._process_primary(sample_doc_set)
+        result = adapter._process_document(sample_doc_set, "insurance_doc")
         
         assert isinstance(result, dict)
         assert result["document_id"] == "insurance_doc"
@@ -111,14 +135,10 @@ class TestMultiDocumentAdapter:
         
     def test_process_supplementary_documents(self, adapter, sample_doc_set):
         """Test processing of supplementary documents"""
-        # Process primary first to set up cache
-        adapter._process_primary(sample_doc_set)
+        result = adapter._process_document(sample_doc_set, "guidelines_doc")
         
-        results = adapter._process_supplementary_docs(sample_doc_set)
-        
-        assert len(results) == 1
-        assert "guidelines_doc" in results
-        assert results["guidelines_doc"]["metadata"]["document_role"] == "supplementary"
+        assert result["document_id"] == "guidelines_doc"
+        assert result["metadata"]["document_role"] == "supplementary"
         
     def test_simple_merge_strategy(self, adapter, sample_doc_set):
         """Test the simple merge strategy"""
@@ -153,6 +173,27 @@ class TestMultiDocumentAdapter:
         assert "supplementary_sections" in unified.tree
         assert len(unified.tree["supplementary_sections"]) == 1
         assert unified.tree["supplementary_sections"][0]["type"] == "criteria_group"
+        assert unified.tree["supplementary_sections"][0]["criteria"][0]["source_document"] == "guidelines_doc"
+        
+        # The merge must not modify its inputs
+        assert "supplementary_sections" not in primary_result["decision_tree"]
+        assert "metadata" not in primary_result["decision_tree"]
+        assert "source_document" not in supplementary_results["guidelines_doc"]["parsed_criteria"][0]
+        
+    def test_merge_attributes_criteria_with_shallow_copies(self, adapter, sample_doc_set):
+        """Test that attribution copies only the criterion's top level"""
+        details = {"min_age": 18}
+        criterion = {"id": "sc1", "details": details}
+        supplementary_results = {
+            "guidelines_doc": {"parsed_criteria": [criterion], "document_id": "guidelines_doc"}
+        }
+        
+        unified = adapter._simple_merge({"decision_tree": {}}, supplementary_results, sample_doc_set)
+        
+        merged = unified.tree["supplementary_sections"][0]["criteria"][0]
+        assert merged["source_document"] == "guidelines_doc"
+        assert merged["details"] is details
+        assert "source_document" not in criterion
         
     def test_extract_criteria_from_tree(self, adapter):
         """Test criteria extraction from tree structure"""
@@ -179,6 +220,24 @@ class TestMultiDocumentAdapter:
         assert any(c["id"] == "c2" for c in criteria)
         assert any(c["id"] == "c3" for c in criteria)
         
+    def test_extract_nested_criteria(self, adapter):
+        """Test criteria extraction below the top level and from dict-keyed nodes"""
+        tree = {
+            "nodes": {
+                "n1": {
+                    "id": "n1",
+                    "branches": [
+                        {"criteria": [{"id": "c1", "criteria": [{"id": "inner"}]}]}
+                    ]
+                },
+                "n2": {"id": "n2", "criteria": [{"id": "c2"}]}
+            }
+        }
+        
+        criteria = adapter._extract_criteria_from_tree(tree)
+        
+        assert [c["id"] for c in criteria] == ["c1", "c2"]
+        
     def test_cache_functionality(self, adapter, sample_doc_set):
         """Test that results are cached"""
         # Process document set
@@ -193,6 +252,30 @@ class TestMultiDocumentAdapter:
         adapter.clear_cache()
         assert len(adapter.cache) == 0
         
+    def test_identical_content_generated_once(self, adapter, sample_doc_set, mock_generator):
+        """Test that re-processing unchanged documents reuses the generated trees"""
+        adapter.process_document_set(sample_doc_set)
+        result = adapter.process_document_set(sample_doc_set)
+        
+        assert mock_generator.generate_decision_tree.call_count == 2
+        assert result.tree["metadata"]["primary_document"] == "insurance_doc"
+        
+        # Clearing the cache forces regeneration
+        adapter.clear_cache()
+        adapter.process_document_set(sample_doc_set)
+        assert mock_generator.generate_decision_tree.call_count == 4
+        
+    def test_cache_evicts_least_recently_used(self, mock_generator, sample_doc_set):
+        """Test that the caches stay within their size limit"""
+        adapter = MultiDocumentAdapter(mock_generator, max_cache_size=1)
+        
+        # One after the other, so the newest entry is known
+        adapter._process_document(sample_doc_set, "insurance_doc")
+        adapter._process_document(sample_doc_set, "guidelines_doc")
+        
+        assert list(adapter.cache) == ["guidelines_doc"]
+        assert len(adapter._tree_cache) == 1
+        
     def test_metadata_enhancement(self, adapter, sample_doc_set):
         """Test that metadata is properly enhanced"""
         result = adapter.process_document_set(sample_doc_set)
@@ -227,6 +310,21 @@ class TestMultiDocumentAdapter:
         assert isinstance(result, UnifiedDecisionTree)
         assert len(result.source_documents) == 2
         
+    def test_single_document_skips_merge(self, adapter, sample_doc_set, mock_generator):
+        """Test that a set of one document is wrapped without merging"""
+        sample_doc_set.documents.pop("guidelines_doc")
+        sample_doc_set.relationships = []
+        stages = []
+        
+        result = adapter.process_document_set(sample_doc_set, on_stage=stages.append)
+        
+        assert stages == ["primary"]
+        assert result.source_documents == ["insurance_doc"]
+        assert result.metadata["merge_strategy"] == "none"
+        assert "supplementary_sections" not in result.tree
+        assert result.tree == adapter.cache["insurance_doc"]["decision_tree"]
+        mock_generator.generate_decision_tree.assert_called_once()
+        
     def test_file_not_found_handling(self, adapter):
         """Test handling of missing files"""
         # Create document set with non-existent files
@@ -245,4 +343,13 @@ class TestMultiDocumentAdapter:
         )
         
         with pytest.raises(FileNotFoundError):
-            adapter.process_document_set(doc_set)
\ No newline at end of file
+            adapter.process_document_set(doc_set)
+            
+    def test_missing_supplementary_fails_before_generation(self, adapter, sample_doc_set, mock_generator):
+        """Test that an unreadable document stops the set before any LLM work"""
+        Path(sample_doc_set.documents["guidelines_doc"].file_path).unlink()
+        
+        with pytest.raises(FileNotFoundError):
+            adapter.process_document_set(sample_doc_set)
+            
+        mock_generator.generate_decision_tree.assert_not_called()
@@ -1,10 +1,13 @@
 """Tests for ConflictResolver."""
 
+import threading
+
 import pytest
 from unittest.mock import Mock, patch
 
-from src.agents.conflict_resolver import ConflictResolver
+from src.agents.conflict_resolver import ConflictResolver, PromptCache
 from src.core.exceptions import ConflictType
+from src.core.schemas import ConflictResolution
 
 
 class TestConflictResolver:
@@ -97,6 +100,98 @@ class TestConflictResolver:
         assert len(result['unresolved']) == 0
         assert result['resolved'][0]['action'] == 'Modified conditions to be mutually exclusive'
 
+    def test_contradictory_paths_resolved_concurrently(self):
+        """Test that LLM calls for one conflict type run in parallel, results kept in order."""
+        conflicts = [
+            {**self.sample_conflicts[0], 'description': f'Conflict {i}'} for i in range(2)
+        ]
+        # Both calls must be in flight at once for the barrier to release
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def generate(prompt, response_schema, system_instruction=None):
+            barrier.wait()
+            description = 'first' if 'Conflict 0' in prompt else 'second'
+            return ConflictResolution(
+                conflict_type='contradictory_paths', description=description,
+                modified_nodes=[], confidence_score=0.9, reasoning='test'
+            )
+        
+        with patch.object(self.resolver.llm, 'generate_structured_json', side_effect=generate):
+            result = self.resolver._resolve_contradictory_paths(self.sample_tree, conflicts)
+            
+        assert [r['action'] for r in result['resolved']] == ['first', 'second']
+        assert result['unresolved'] == []
+        
+    def test_failed_llm_call_leaves_only_its_conflict_unresolved(self):
+        """Test that one failing call does not affect the other conflicts of its type."""
+        conflicts = [
+            {**self.sample_conflicts[0], 'type': ConflictType.OVERLAPPING_CONDITIONS.value,
+             'description': f'Conflict {i}'}
+            for i in range(3)
+        ]
+        
+        def generate(prompt, system_instruction=None):
+            if 'Conflict 1' in prompt:
+                raise RuntimeError("rate limited")
+            return "Refined"
+        
+        with patch.object(self.resolver.llm, 'generate_text', side_effect=generate):
+            result = self.resolver._resolve_overlapping_conditions(self.sample_tree, conflicts)
+            
+        assert [r['conflict']['description'] for r in result['resolved']] == ['Conflict 0', 'Conflict 2']
+        assert result['unresolved'] == [conflicts[1]]
+        
+    def test_contradictory_paths_share_instruction_prefix(self):
+        """Test that the tree goes into one shared system instruction, not each prompt."""
+        conflicts = [
+            {**self.sample_conflicts[0], 'description': f'Conflict {i}'} for i in range(2)
+        ]
+        resolution = ConflictResolution(
+            conflict_type='contradictory_paths', description='Split the condition',
+            modified_nodes=[], confidence_score=0.8, reasoning='test'
+        )
+        
+        with patch.object(self.resolver.llm, 'generate_structured_json', return_value=resolution) as mock_generate:
+            self.resolver._resolve_contradictory_paths(self.sample_tree, conflicts)
+            
+        calls = mock_generate.call_args_list
+        instructions = {call.kwargs['system_instruction'] for call in calls}
+        assert len(instructions) == 1
+        assert '"id":"node1"' in instructions.pop()
+        assert sorted(call.kwargs['prompt'] for call in calls) == [
+            "Conflict: Conflict 0\nAffected nodes: ['node1', 'node2']",
+            "Conflict: Conflict 1\nAffected nodes: ['node1', 'node2']",
+        ]
+        
+    def test_duplicate_conflicts_share_one_llm_call(self):
+        """Test that identical prompts are answered from the prompt cache."""
+        conflicts = [dict(self.sample_conflicts[0]) for _ in range(3)]
+        resolution = ConflictResolution(
+            conflict_type='contradictory_paths', description='Split the condition',
+            modified_nodes=[], confidence_score=0.8, reasoning='test'
+        )
+        
+        with patch.object(self.resolver.llm, 'generate_structured_json', return_value=resolution) as mock_generate:
+            result = self.resolver._resolve_contradictory_paths(self.sample_tree, conflicts)
+            
+        assert mock_generate.call_count == 1
+        assert [r['action'] for r in result['resolved']] == ['Split the condition'] * 3
+        
+    def test_prompt_cache_evicts_and_skips_failures(self):
+        """Test that the prompt cache is LRU-bounded and does not store errors."""
+        cache = PromptCache(max_size=2)
+        
+        with pytest.raises(RuntimeError):
+            cache.get_or_create('a', Mock(side_effect=RuntimeError("timeout")))
+        assert cache.get_or_create('a', lambda: 'A') == 'A'
+        cache.get_or_create('b', lambda: 'B')
+        cache.get_or_create('a', lambda: 'stale')  # refreshes 'a'
+        cache.get_or_create('c', lambda: 'C')
+        
+        assert len(cache) == 2
+        assert cache.get_or_create('a', lambda: 'new') == 'A'
+        assert cache.get_or_create('b', lambda: 'new') == 'new'
+        
     def test_resolve_circular_dependencies(self):
         """Test resolution of circular dependencies."""
         conflicts = [self.sample_conflicts[1]]
@@ -130,6 +225,25 @@ class TestConflictResolver:
         # Check that some nodes were removed
         assert len(result['tree']['nodes']) < len(self.sample_tree['nodes'])
 
+    def test_resolve_several_redundant_path_conflicts(self):
+        """Test that removals from every redundant-path conflict are applied."""
+        conflicts = [
+            {
+                'type': ConflictType.REDUNDANT_PATHS.value,
+                'description': 'Multiple paths with identical conditions',
+                'nodes': pair,
+                'severity': 'medium'
+            }
+            for pair in (['node1', 'node2'], ['node3', 'node4'])
+        ]
+        
+        result = self.resolver._resolve_redundant_paths(self.sample_tree.copy(), conflicts)
+        
+        assert len(result['resolved']) == 2
+        assert [n['id'] for n in result['tree']['nodes']] == ['node1', 'node3', 'approve', 'deny']
+        node3 = result['tree']['nodes'][1]
+        assert node3['connections'] == []
+        
     def test_resolve_overlapping_conditions(self):
         """Test resolution of overlapping conditions."""
         conflict = {
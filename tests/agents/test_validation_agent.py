@@ -419,6 +419,33 @@ class TestValidationAgent:
         assert result["is_valid"] is False
         assert len(result["conflicts"]) > 0
 
+    
+    def test_validate_reuses_cached_results_for_unchanged_tree(self):
+        """Test that re-validating the same tree skips the LLM checks."""
+        self.agent.config.enable_caching = True
+        mock_response = LogicalConsistencyCheck(issues=[])
+        
+        with patch.object(self.agent.llm, 'generate_structured_json', return_value=mock_response) as mock_llm:
+            first = self.agent.validate(self.valid_tree)
+            calls_after_first = mock_llm.call_count
+            second = self.agent.validate(self.valid_tree)
+        
+        assert mock_llm.call_count == calls_after_first
+        assert second == first
+        assert second is not first
+    
+    def test_validate_skips_cache_when_disabled(self):
+        """Test that caching can be turned off through config."""
+        self.agent.config.enable_caching = False
+        mock_response = LogicalConsistencyCheck(issues=[])
+        
+        with patch.object(self.agent.llm, 'generate_structured_json', return_value=mock_response) as mock_llm:
+            self.agent.validate(self.valid_tree)
+            calls_after_first = mock_llm.call_count
+            self.agent.validate(self.valid_tree)
+        
+        assert mock_llm.call_count == 2 * calls_after_first
+        assert len(self.agent.cache) == 0
 
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -130,6 +130,18 @@ class TestDecisionTreeGenerator:
         assert isinstance(result, dict)
         assert result == self.sample_tree
 
+    def test_on_step_called_before_each_step(self):
+        """Test that the on_step callback reports each step before it runs."""
+        events = []
+        with patch.object(self.generator.parser_agent, 'parse', side_effect=lambda _: events.append("parse") or self.sample_parsed_criteria), \
+             patch.object(self.generator.structure_agent, 'create_tree', return_value=self.sample_tree), \
+             patch.object(self.generator.validation_agent, 'validate', return_value=self.sample_validation_results), \
+             patch.object(self.generator.refinement_agent, 'refine', return_value=self.sample_tree):
+
+            self.generator.generate_decision_tree(self.sample_ocr_text, on_step=events.append)
+
+        assert events == [1, "parse", 2, 3, 4]
+
     def test_criteria_parsing_error_propagation(self):
         """Test that CriteriaParsingError is properly propagated."""
         # Mock parser to raise an exception
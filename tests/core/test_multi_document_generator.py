@@ -86,6 +86,21 @@ class TestMultiDocumentGenerator:
         assert isinstance(result, dict)
         assert result == {"final": "tree"}
         
+    @patch('src.core.decision_tree_generator.get_config')
+    @patch('src.core.decision_tree_generator.LlmClient')
+    def test_single_document_reports_stages(self, mock_llm, mock_get_config, mock_config_disabled, sample_files):
+        """Test that single document processing reports its stages to on_stage"""
+        mock_get_config.return_value = mock_config_disabled
+        
+        generator = DecisionTreeGenerator(verbose=False)
+        generator.generate_decision_tree = Mock(return_value={"final": "tree"})
+        stages = []
+        
+        result = generator.generate_from_documents(sample_files["single"], on_stage=stages.append)
+        
+        assert result == {"final": "tree"}
+        assert stages == ["primary", "finalize"]
+        
     @patch('src.core.decision_tree_generator.get_config')
     @patch('src.core.decision_tree_generator.LlmClient')
     def test_multi_document_enabled_processing(self, mock_llm, mock_get_config, mock_config_enabled, sample_files):
@@ -130,6 +145,7 @@ class TestMultiDocumentGenerator:
             
             assert isinstance(result, UnifiedDecisionTree)
             assert len(result.source_documents) == 2
+            assert result.as_tree_dict() is result.tree
             
     @patch('src.core.decision_tree_generator.get_config')
     @patch('src.core.decision_tree_generator.LlmClient')
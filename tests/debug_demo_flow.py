@@ -4,10 +4,18 @@ Diagnostic script that replicates the exact demo.py execution flow
 to identify where the hanging occurs.
 """
 
+import os
+import json
+import math
+import logging
 import time
-import signal
+import argparse
+import functools
+import threading
 import traceback
 from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional
 
 from src.core.decision_tree_generator import DecisionTreeGenerator
 from src.demo.orchestrator import DemoOrchestrator
@@ -15,122 +23,220 @@ from src.agents.criteria_parser_agent import CriteriaParserAgent
 from src.agents.tree_structure_agent import TreeStructureAgent
 from src.agents.validation_agent import ValidationAgent
 from src.agents.refinement_agent import RefinementAgent
+from src.core.config import get_config
 
 
-class TimeoutHandler:
-    """Context manager for handling timeouts in tests."""
+logger = logging.getLogger(__name__)
+
+# Formatting full tracebacks is costly in failure-heavy reruns; opt in with DEBUG_TRACEBACKS=1
+DEBUG_TRACEBACKS = bool(os.environ.get("DEBUG_TRACEBACKS"))
+
+
+def log_exception(context: str) -> None:
+    """
+    Record the exception currently being handled.
+    
+    The traceback is attached to a DEBUG log record, so it is only formatted
+    when debug logging is enabled, and printed to stderr only when
+    DEBUG_TRACEBACKS is set.
+    """
+    logger.debug("%s failed", context, exc_info=True)
+    if DEBUG_TRACEBACKS:
+        traceback.print_exc()
+
+
+# Read the test document once per session instead of once per test
+JARDIANCE_PATH = Path("examples/jardiance_criteria.txt")
+JARDIANCE_CONTENT = JARDIANCE_PATH.read_text() if JARDIANCE_PATH.exists() else None
+
+
+# Candidate models, cheapest first
+MODEL_COST_ORDER = [
+    "gemini-2.5-flash-lite-preview-06-17",
+    "gemini-2.5-flash-preview-05-20",
+    "gemini-2.5-pro-preview-06-05",
+]
+
+# Set from --cache-dir in main(); when None timings are neither stored nor used
+_TIMINGS_PATH: Optional[Path] = None
+
+
+def record_timings(timings_path: Path, content_len: int, model: str, timings: dict) -> None:
+    """Append one step-by-step timing run to the JSONL log."""
+    timings_path.parent.mkdir(parents=True, exist_ok=True)
+    record = {"content_len": content_len, "model": model, **timings}
+    with open(timings_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+def _fit_latency(samples: list) -> tuple:
+    """Least-squares fit of latency = intercept + slope * content_len."""
+    n = len(samples)
+    mean_x = sum(x for x, _ in samples) / n
+    mean_y = sum(y for _, y in samples) / n
+    var_x = sum((x - mean_x) ** 2 for x, _ in samples)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in samples) / var_x if var_x else 0.0
+    return mean_y - slope * mean_x, slope
+
+
+def choose_model(content_len: int, timings_path: Path, timeout_seconds: float) -> Optional[str]:
+    """
+    Pick the cheapest model whose predicted p95 stage latency fits the timeout.
+    
+    Fits a length -> latency line per model from earlier runs and pads the
+    prediction with the 95th percentile residual. Returns None when no model
+    has enough history, so the configured default is kept.
+    """
+    if not timings_path.exists():
+        return None
+    
+    samples_by_model = {}
+    with open(timings_path, encoding="utf-8") as f:
+        for line in f:
+            record = json.loads(line)
+            stage_times = [record[k] for k in ("parse", "structure", "validation", "refinement") if k in record]
+            if stage_times:
+                samples_by_model.setdefault(record["model"], []).append(
+                    (record["content_len"], max(stage_times))
+                )
+    
+    for model in MODEL_COST_ORDER:
+        samples = samples_by_model.get(model)
+        if not samples:
+            continue
+        intercept, slope = _fit_latency(samples)
+        residuals = sorted(y - (intercept + slope * x) for x, y in samples)
+        p95_residual = max(0.0, residuals[math.ceil(0.95 * len(residuals)) - 1])
+        if intercept + slope * content_len + p95_residual < timeout_seconds:
+            return model
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_agents() -> dict:
+    """Build the pipeline agents once and share them across tests."""
+    agents = {
+        "parser": CriteriaParserAgent(),
+        "structure": TreeStructureAgent(),
+        "validation": ValidationAgent(),
+        "refinement": RefinementAgent(),
+    }
+    
+    if _TIMINGS_PATH is not None and JARDIANCE_CONTENT is not None:
+        model = choose_model(len(JARDIANCE_CONTENT), _TIMINGS_PATH, get_config().timeout_seconds)
+        if model is not None:
+            print(f"📈 Using {model} based on recorded timings")
+            for agent in agents.values():
+                agent.llm.model_name = model
+            agents["refinement"].conflict_resolver.llm.model_name = model
+    
+    return agents
+
+
+def run_with_timeout(timeout_seconds, func, *args, **kwargs):
+    """
+    Run func in a daemon thread and wait at most timeout_seconds for it.
     
-    def __init__(self, timeout_seconds):
-        self.timeout_seconds = timeout_seconds
-        self.timed_out = False
+    Unlike SIGALRM this works off the main thread. A call that times out is
+    abandoned rather than stopped; because its thread is a daemon, a hung API
+    call neither blocks later stages nor keeps the script from exiting.
     
-    def timeout_handler(self, signum, frame):
-        self.timed_out = True
-        raise TimeoutError(f"Operation timed out after {self.timeout_seconds} seconds")
+    Raises:
+        TimeoutError: If the call does not finish in time
+    """
+    outcome = {}
     
-    def __enter__(self):
-        self.old_handler = signal.signal(signal.SIGALRM, self.timeout_handler)
-        signal.alarm(self.timeout_seconds)
-        return self
+    def target():
+        try:
+            outcome["result"] = func(*args, **kwargs)
+        except BaseException as e:
+            outcome["error"] = e
+    
+    thread = threading.Thread(target=target, name="timed-stage", daemon=True)
+    thread.start()
+    thread.join(timeout_seconds)
+    if thread.is_alive():
+        raise TimeoutError(f"call did not finish within {timeout_seconds}s")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+# (stage key, agent name, step label, timeout seconds) in pipeline order
+PIPELINE_STAGES = [
+    ("parse", "CriteriaParserAgent", "Parsing criteria", 45),
+    ("structure", "TreeStructureAgent", "Creating tree structure", 45),
+    ("validation", "ValidationAgent", "Validating tree", 30),
+    ("refinement", "RefinementAgent", "Refining tree", 30),
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _run_pipeline_once(content: str) -> dict:
+    """
+    Run parse -> structure -> validate -> refine once for the given content.
+    
+    Both the individual-agent and the step-by-step probes report on this
+    single pass, so the four LLM-backed stages are not executed twice.
+    
+    Returns:
+        Dict with the stage outputs ("parsed", "tree", "validation", "final"),
+        per-stage "timings", and "failed_stage"/"error" if a stage failed.
+    """
+    agents = get_agents()
+    run = {"timings": {}, "failed_stage": None, "error": None}
+    steps = {
+        "parse": ("parsed", lambda: agents["parser"].parse(content)),
+        "structure": ("tree", lambda: agents["structure"].create_tree(run["parsed"])),
+        "validation": ("validation", lambda: agents["validation"].validate(run["tree"])),
+        "refinement": ("final", lambda: agents["refinement"].refine(run["tree"], run["validation"])),
+    }
+    
+    print("Running pipeline once for all per-stage probes...")
+    for stage, _agent_name, label, timeout_seconds in PIPELINE_STAGES:
+        result_key, call = steps[stage]
+        print(f"   {label}...")
+        start = time.time()
+        try:
+            run[result_key] = run_with_timeout(timeout_seconds, call)
+        except TimeoutError:
+            run["failed_stage"] = stage
+            run["error"] = f"timed out after {timeout_seconds}s"
+            break
+        except Exception as e:
+            log_exception(f"Pipeline stage {stage}")
+            run["failed_stage"] = stage
+            run["error"] = f"failed: {e}"
+            break
+        run["timings"][stage] = time.time() - start
     
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        signal.alarm(0)  # Cancel alarm
-        signal.signal(signal.SIGALRM, self.old_handler)  # Restore handler
+    return run
 
 
 def test_individual_agents():
     """Test each agent individually with Jardiance content."""
     print("=== Testing Individual Agents ===")
     
-    # Load Jardiance content
-    jardiance_path = Path("examples/jardiance_criteria.txt")
-    if not jardiance_path.exists():
+    if JARDIANCE_CONTENT is None:
         print("❌ Jardiance criteria file not found")
         return False
     
-    with open(jardiance_path, 'r') as f:
-        content = f.read()
-    
-    print(f"Content length: {len(content)} characters")
-    
-    # Test 1: Criteria Parser Agent
-    print("\n1. Testing CriteriaParserAgent...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start_time = time.time()
-            parser = CriteriaParserAgent()
-            parsed_result = parser.parse(content)
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ CriteriaParserAgent timed out after 30s")
-                return False
-            else:
-                print(f"✅ CriteriaParserAgent completed in {elapsed:.2f}s")
-                print(f"   Result keys: {list(parsed_result.keys())}")
-    except Exception as e:
-        print(f"❌ CriteriaParserAgent failed: {e}")
-        traceback.print_exc()
-        return False
-    
-    # Test 2: Tree Structure Agent
-    print("\n2. Testing TreeStructureAgent...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start_time = time.time()
-            structure_agent = TreeStructureAgent()
-            tree_result = structure_agent.create_tree(parsed_result)
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ TreeStructureAgent timed out after 30s")
-                return False
-            else:
-                print(f"✅ TreeStructureAgent completed in {elapsed:.2f}s")
-                print(f"   Result keys: {list(tree_result.keys())}")
-    except Exception as e:
-        print(f"❌ TreeStructureAgent failed: {e}")
-        traceback.print_exc()
-        return False
-    
-    # Test 3: Validation Agent
-    print("\n3. Testing ValidationAgent...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start_time = time.time()
-            validation_agent = ValidationAgent()
-            validation_result = validation_agent.validate(tree_result)
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ ValidationAgent timed out after 30s")
-                return False
-            else:
-                print(f"✅ ValidationAgent completed in {elapsed:.2f}s")
-                print(f"   Issues found: {len(validation_result.issues) if hasattr(validation_result, 'issues') else 'Unknown'}")
-    except Exception as e:
-        print(f"❌ ValidationAgent failed: {e}")
-        traceback.print_exc()
-        return False
-    
-    # Test 4: Refinement Agent
-    print("\n4. Testing RefinementAgent...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start_time = time.time()
-            refinement_agent = RefinementAgent()
-            final_result = refinement_agent.refine(tree_result, validation_result)
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ RefinementAgent timed out after 30s")
-                return False
-            else:
-                print(f"✅ RefinementAgent completed in {elapsed:.2f}s")
-    except Exception as e:
-        print(f"❌ RefinementAgent failed: {e}")
-        traceback.print_exc()
-        return False
+    print(f"Content length: {len(JARDIANCE_CONTENT)} characters")
+    run = _run_pipeline_once(JARDIANCE_CONTENT)
+    
+    for i, (stage, agent_name, _label, _timeout) in enumerate(PIPELINE_STAGES, start=1):
+        print(f"\n{i}. Testing {agent_name}...")
+        if run["failed_stage"] == stage:
+            print(f"❌ {agent_name} {run['error']}")
+            return False
+        print(f"✅ {agent_name} completed in {run['timings'][stage]:.2f}s")
+        if stage == "parse":
+            print(f"   Result keys: {list(run['parsed'].keys())}")
+        elif stage == "structure":
+            print(f"   Result keys: {list(run['tree'].keys())}")
+        elif stage == "validation":
+            validation_result = run["validation"]
+            print(f"   Issues found: {len(validation_result.issues) if hasattr(validation_result, 'issues') else 'Unknown'}")
     
     print("\n✅ All individual agents completed successfully!")
     return True
@@ -140,32 +246,30 @@ def test_decision_tree_generator():
     """Test the full DecisionTreeGenerator pipeline."""
     print("\n=== Testing DecisionTreeGenerator Pipeline ===")
     
-    jardiance_path = Path("examples/jardiance_criteria.txt")
-    with open(jardiance_path, 'r') as f:
-        content = f.read()
+    if JARDIANCE_CONTENT is None:
+        print("❌ Jardiance criteria file not found")
+        return False
     
     try:
-        with TimeoutHandler(60) as timeout:
-            start_time = time.time()
-            generator = DecisionTreeGenerator()
-            
-            print("Starting full pipeline...")
-            result = generator.generate_decision_tree(content)
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ DecisionTreeGenerator timed out after 60s")
-                return False
-            else:
-                print(f"✅ DecisionTreeGenerator completed in {elapsed:.2f}s")
-                print(f"   Result type: {type(result)}")
-                if isinstance(result, dict):
-                    print(f"   Result keys: {list(result.keys())}")
-                return True
-                
+        start_time = time.time()
+        generator = DecisionTreeGenerator()
+        
+        print("Starting full pipeline...")
+        result = run_with_timeout(60, generator.generate_decision_tree, JARDIANCE_CONTENT)
+        elapsed = time.time() - start_time
+        
+        print(f"✅ DecisionTreeGenerator completed in {elapsed:.2f}s")
+        print(f"   Result type: {type(result)}")
+        if isinstance(result, dict):
+            print(f"   Result keys: {list(result.keys())}")
+        return True
+        
+    except TimeoutError:
+        print(f"❌ DecisionTreeGenerator timed out after 60s")
+        return False
     except Exception as e:
         print(f"❌ DecisionTreeGenerator failed: {e}")
-        traceback.print_exc()
+        log_exception("DecisionTreeGenerator")
         return False
 
 
@@ -173,31 +277,27 @@ def test_orchestrator():
     """Test the DemoOrchestrator process_document method."""
     print("\n=== Testing DemoOrchestrator ===")
     
-    jardiance_path = Path("examples/jardiance_criteria.txt")
-    
     try:
-        with TimeoutHandler(90) as timeout:
-            start_time = time.time()
-            orchestrator = DemoOrchestrator(output_dir="debug_outputs")
-            
-            print("Starting orchestrator.process_document...")
-            result = orchestrator.process_document(str(jardiance_path))
-            elapsed = time.time() - start_time
-            
-            if timeout.timed_out:
-                print(f"❌ DemoOrchestrator timed out after 90s")
-                return False
-            else:
-                print(f"✅ DemoOrchestrator completed in {elapsed:.2f}s")
-                print(f"   Success: {result.success}")
-                print(f"   Processing time: {result.processing_time:.2f}s")
-                if not result.success:
-                    print(f"   Error: {result.error}")
-                return result.success
-                
+        start_time = time.time()
+        orchestrator = DemoOrchestrator(output_dir="debug_outputs")
+        
+        print("Starting orchestrator.process_document...")
+        result = run_with_timeout(90, orchestrator.process_document, str(JARDIANCE_PATH))
+        elapsed = time.time() - start_time
+        
+        print(f"✅ DemoOrchestrator completed in {elapsed:.2f}s")
+        print(f"   Success: {result.success}")
+        print(f"   Processing time: {result.processing_time:.2f}s")
+        if not result.success:
+            print(f"   Error: {result.error}")
+        return result.success
+        
+    except TimeoutError:
+        print(f"❌ DemoOrchestrator timed out after 90s")
+        return False
     except Exception as e:
         print(f"❌ DemoOrchestrator failed: {e}")
-        traceback.print_exc()
+        log_exception("DemoOrchestrator")
         return False
 
 
@@ -205,83 +305,22 @@ def test_step_by_step_with_timing():
     """Test each step with detailed timing to identify bottlenecks."""
     print("\n=== Step-by-Step Timing Analysis ===")
     
-    jardiance_path = Path("examples/jardiance_criteria.txt")
-    with open(jardiance_path, 'r') as f:
-        content = f.read()
-    
-    print(f"Document size: {len(content)} characters")
-    
-    # Initialize all components
-    parser = CriteriaParserAgent()
-    structure_agent = TreeStructureAgent()
-    validation_agent = ValidationAgent()
-    refinement_agent = RefinementAgent()
-    
-    timings = {}
-    
-    # Step 1: Parse criteria
-    print("\nStep 1: Parsing criteria...")
-    try:
-        with TimeoutHandler(45) as timeout:
-            start = time.time()
-            parsed_criteria = parser.parse(content)
-            timings['parse'] = time.time() - start
-            
-            if timeout.timed_out:
-                print("❌ Parsing timed out")
-                return False
-            print(f"✅ Parsing completed in {timings['parse']:.2f}s")
-    except Exception as e:
-        print(f"❌ Parsing failed: {e}")
+    if JARDIANCE_CONTENT is None:
+        print("❌ Jardiance criteria file not found")
         return False
     
-    # Step 2: Create tree structure
-    print("\nStep 2: Creating tree structure...")
-    try:
-        with TimeoutHandler(45) as timeout:
-            start = time.time()
-            initial_tree = structure_agent.create_tree(parsed_criteria)
-            timings['structure'] = time.time() - start
-            
-            if timeout.timed_out:
-                print("❌ Tree structure timed out")
-                return False
-            print(f"✅ Tree structure completed in {timings['structure']:.2f}s")
-    except Exception as e:
-        print(f"❌ Tree structure failed: {e}")
-        return False
+    content = JARDIANCE_CONTENT
+    print(f"Document size: {len(content)} characters")
     
-    # Step 3: Validate tree
-    print("\nStep 3: Validating tree...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start = time.time()
-            validation_results = validation_agent.validate(initial_tree)
-            timings['validation'] = time.time() - start
-            
-            if timeout.timed_out:
-                print("❌ Validation timed out")
-                return False
-            print(f"✅ Validation completed in {timings['validation']:.2f}s")
-    except Exception as e:
-        print(f"❌ Validation failed: {e}")
-        return False
+    run = _run_pipeline_once(content)
+    timings = run["timings"]
     
-    # Step 4: Refine tree
-    print("\nStep 4: Refining tree...")
-    try:
-        with TimeoutHandler(30) as timeout:
-            start = time.time()
-            final_tree = refinement_agent.refine(initial_tree, validation_results)
-            timings['refinement'] = time.time() - start
-            
-            if timeout.timed_out:
-                print("❌ Refinement timed out")
-                return False
-            print(f"✅ Refinement completed in {timings['refinement']:.2f}s")
-    except Exception as e:
-        print(f"❌ Refinement failed: {e}")
-        return False
+    for i, (stage, _agent_name, label, _timeout) in enumerate(PIPELINE_STAGES, start=1):
+        print(f"\nStep {i}: {label}...")
+        if run["failed_stage"] == stage:
+            print(f"❌ {label} {run['error']}")
+            return False
+        print(f"✅ {label} completed in {timings[stage]:.2f}s")
     
     # Summary
     total_time = sum(timings.values())
@@ -292,11 +331,36 @@ def test_step_by_step_with_timing():
     print(f"   Refinement: {timings['refinement']:.2f}s ({timings['refinement']/total_time*100:.1f}%)")
     print(f"   TOTAL:      {total_time:.2f}s")
     
+    if _TIMINGS_PATH is not None:
+        record_timings(_TIMINGS_PATH, len(content), get_agents()["parser"].llm.model_name, timings)
+        print(f"   Timings appended to {_TIMINGS_PATH}")
+    
     return True
 
 
-def main():
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of one diagnostic test."""
+    name: str
+    passed: bool
+    elapsed: float
+
+
+def main(argv=None):
     """Run all diagnostic tests."""
+    global _TIMINGS_PATH
+    
+    arg_parser = argparse.ArgumentParser(description="Demo flow diagnostic tests")
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Record stage timings here and use them to pick a model (e.g. debug_outputs)",
+    )
+    args = arg_parser.parse_args(argv)
+    if args.cache_dir is not None:
+        _TIMINGS_PATH = args.cache_dir / "timings.jsonl"
+    
     print("🔍 Demo Flow Diagnostic Tests")
     print("=" * 50)
     
@@ -307,40 +371,40 @@ def main():
         ("DemoOrchestrator", test_orchestrator),
     ]
     
-    results = {}
+    results = []
     
     for test_name, test_func in tests:
         print(f"\n{'='*20} {test_name} {'='*20}")
+        start_time = time.time()
         try:
-            start_time = time.time()
-            result = test_func()
-            elapsed = time.time() - start_time
-            results[test_name] = result
-            status = "✅ PASS" if result else "❌ FAIL"
-            print(f"\n{status} {test_name} ({elapsed:.2f}s total)")
-            
+            passed = test_func() is True
         except KeyboardInterrupt:
             print(f"\n🛑 {test_name} interrupted by user")
-            results[test_name] = False
+            results.append(TestResult(test_name, False, time.time() - start_time))
             break
         except Exception as e:
             print(f"\n💥 {test_name} crashed: {e}")
-            traceback.print_exc()
-            results[test_name] = False
+            log_exception(test_name)
+            passed = False
+        
+        result = TestResult(test_name, passed, time.time() - start_time)
+        results.append(result)
+        status = "✅ PASS" if passed else "❌ FAIL"
+        print(f"\n{status} {test_name} ({result.elapsed:.2f}s total)")
     
     # Final summary
     print("\n" + "=" * 50)
     print("🏁 Demo Flow Test Results")
     print("=" * 50)
     
-    for test_name, passed in results.items():
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status} {test_name}")
+    passed_count = 0
+    for result in results:
+        passed_count += result.passed
+        status = "✅ PASS" if result.passed else "❌ FAIL"
+        print(f"{status} {result.name}")
     
-    passed_count = sum(1 for result in results.values() if result is True)
-    total_count = len(results)
-    print(f"\nOverall: {passed_count}/{total_count} tests passed")
+    print(f"\nOverall: {passed_count}/{len(results)} tests passed")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -4,27 +4,249 @@ Diagnostic script to investigate Gemini API hanging issues.
 Tests various scenarios to identify the root cause.
 """
 
+import io
 import os
+import sys
 import json
 import time
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import logging
+import argparse
+import functools
 import traceback
 from pathlib import Path
+from dataclasses import dataclass
+from typing import Optional, Type
 
-from google import genai
 from google.genai import types
 from dotenv import load_dotenv
+from pydantic import BaseModel, ValidationError
 
-from src.core.llm_client import LlmClient
+from src.core.llm_client import LlmClient, get_genai_client
 from src.core.schemas import ParsedCriteria, DecisionNode, QuestionOrder
 from src.core.config import get_config
 
 
+logger = logging.getLogger(__name__)
+
+# Formatting full tracebacks is costly in failure-heavy reruns; opt in with DEBUG_TRACEBACKS=1
+DEBUG_TRACEBACKS = bool(os.environ.get("DEBUG_TRACEBACKS"))
+
+
+def log_exception(context: str) -> None:
+    """
+    Record the exception currently being handled.
+    
+    The traceback is attached to a DEBUG log record, so it is only formatted
+    when debug logging is enabled, and printed to stderr only when
+    DEBUG_TRACEBACKS is set.
+    """
+    logger.debug("%s failed", context, exc_info=True)
+    if DEBUG_TRACEBACKS:
+        traceback.print_exc()
+
+
+# Resolve the environment once at import instead of in every test
+load_dotenv()
+API_KEY = os.getenv("GOOGLE_API_KEY")
+
+
+# Bump when prompts or response handling change so stale cache entries are ignored
+CACHE_PROMPT_VERSION = "v1"
+CACHE_PROVIDER = "gemini"
+
+
+class ExtractionCache:
+    """
+    Content-addressable on-disk cache for LLM responses.
+
+    Entries are keyed by provider, model, prompt version and a SHA256 digest
+    of the full request (length-prefixed prompt, system instruction and
+    response schema), so a rerun with identical inputs never hits the API.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def make_key(self, model: str, prompt: str, system_instruction: Optional[str] = None,
+                 response_schema: Optional[Type[BaseModel]] = None) -> str:
+        """Build the cache key for a single LLM request."""
+        digest = hashlib.sha256()
+        for part in (prompt, system_instruction or ""):
+            data = part.encode("utf-8")
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+        if response_schema is not None:
+            schema_json = json.dumps(response_schema.model_json_schema(), sort_keys=True)
+            digest.update(schema_json.encode("utf-8"))
+        return f"{CACHE_PROVIDER}-{model}-{CACHE_PROMPT_VERSION}-{digest.hexdigest()}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str, response_schema: Optional[Type[BaseModel]] = None):
+        """Return the cached response, or None on a miss or a stale entry."""
+        path = self._path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if response_schema is not None:
+                value = response_schema.model_validate(payload["value"])
+            else:
+                value = payload["value"]
+        except (ValidationError, json.JSONDecodeError, KeyError):
+            # Schema drifted since the entry was written - evict and refetch
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value) -> None:
+        """Store a response (plain text or Pydantic model) under the key."""
+        if isinstance(value, BaseModel):
+            value = value.model_dump(mode="json")
+        self._path(key).write_text(json.dumps({"value": value}), encoding="utf-8")
+
+
+# Requests per second allowed by the rate-limit probe
+RATE_LIMIT_QPS = float(os.getenv("GEMINI_QPS", "5"))
+
+
+class AsyncTokenBucket:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+    
+    Allows bursts of up to `capacity` requests, then refills at `rate`
+    tokens per second. Callers only sleep when the bucket is empty.
+    """
+    
+    def __init__(self, rate: float, capacity: Optional[int] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Set from --cache-dir in main(); when None every call goes to the API
+_CACHE: Optional[ExtractionCache] = None
+
+
+def with_extraction_cache(client: LlmClient) -> LlmClient:
+    """Wrap the client's generation methods with the extraction cache, if enabled."""
+    if _CACHE is None:
+        return client
+
+    generate_text = client.generate_text
+    generate_structured_json = client.generate_structured_json
+
+    @functools.wraps(generate_text)
+    def cached_generate_text(prompt: str, system_instruction: str = None) -> str:
+        key = _CACHE.make_key(client.model_name, prompt, system_instruction)
+        cached = _CACHE.get(key)
+        if cached is not None:
+            return cached
+        response = generate_text(prompt, system_instruction=system_instruction)
+        _CACHE.put(key, response)
+        return response
+
+    @functools.wraps(generate_structured_json)
+    def cached_generate_structured_json(prompt: str, response_schema, system_instruction: str = None):
+        key = _CACHE.make_key(client.model_name, prompt, system_instruction, response_schema)
+        cached = _CACHE.get(key, response_schema)
+        if cached is not None:
+            return cached
+        response = generate_structured_json(prompt, response_schema, system_instruction=system_instruction)
+        _CACHE.put(key, response)
+        return response
+
+    client.generate_text = cached_generate_text
+    client.generate_structured_json = cached_generate_structured_json
+    return client
+
+
+# Read the Jardiance document once per run instead of once per test
+JARDIANCE_PATH = Path("examples/jardiance_criteria.txt")
+JARDIANCE_CONTENT = JARDIANCE_PATH.read_text(encoding="utf-8") if JARDIANCE_PATH.exists() else None
+
+# Gemini 2.5 input context window
+MODEL_INPUT_TOKEN_LIMIT = 1_048_576
+
+
+@functools.cache
+def count_prompt_tokens(model: str, prompt: str) -> Optional[int]:
+    """
+    Count prompt tokens once per (model, prompt) via the SDK.
+    
+    Returns None if counting fails, in which case callers just send the prompt.
+    """
+    try:
+        return get_genai_client(API_KEY).models.count_tokens(model=model, contents=prompt).total_tokens
+    except Exception as e:
+        print(f"⚠️  Token counting failed: {e}")
+        return None
+
+
+@functools.cache
+def get_llm_client() -> LlmClient:
+    """Shared LlmClient for all tests, wrapped with the extraction cache if enabled."""
+    return with_extraction_cache(LlmClient())
+
+
+def consume_text_stream(client: LlmClient, prompt: str, budget_seconds: float):
+    """
+    Stream a text response, cancelling once the time budget is exhausted.
+    
+    Returns:
+        (text, first_chunk_seconds, elapsed_seconds, completed). first_chunk_seconds
+        is None if nothing arrived; completed is False if the stream was cancelled.
+    """
+    start_time = time.time()
+    first_chunk_at = None
+    chunks = []
+    completed = True
+    
+    stream = client.generate_text_stream(prompt)
+    try:
+        for chunk in stream:
+            if first_chunk_at is None:
+                first_chunk_at = time.time() - start_time
+            chunks.append(chunk)
+            if time.time() - start_time > budget_seconds:
+                completed = False
+                break
+    finally:
+        stream.close()
+    
+    return "".join(chunks), first_chunk_at, time.time() - start_time, completed
+
+
 def test_basic_api_connection():
     """Test basic API connectivity and authentication."""
     print("=== Testing Basic API Connection ===")
     
-    load_dotenv()
-    api_key = os.getenv("GOOGLE_API_KEY")
+    api_key = API_KEY
     
     if not api_key:
         print("❌ No GOOGLE_API_KEY found in environment")
@@ -33,7 +255,7 @@ def test_basic_api_connection():
     print(f"✅ API Key found (ends with: ...{api_key[-8:]})")
     
     try:
-        client = genai.Client(api_key=api_key)
+        client = get_genai_client(API_KEY)
         start_time = time.time()
         
         response = client.models.generate_content(
@@ -52,7 +274,7 @@ def test_basic_api_connection():
             print(f"Error code: {e.code}")
         if hasattr(e, 'details'):
             print(f"Error details: {e.details}")
-        traceback.print_exc()
+        log_exception("Basic API connection")
         return False
 
 
@@ -61,7 +283,7 @@ def test_structured_json_simple():
     print("\n=== Testing Simple Structured JSON ===")
     
     try:
-        client = LlmClient()
+        client = get_llm_client()
         start_time = time.time()
         
         # Simple schema
@@ -83,7 +305,7 @@ def test_structured_json_simple():
     except Exception as e:
         print(f"❌ Simple structured JSON failed: {e}")
         print(f"Error type: {type(e).__name__}")
-        traceback.print_exc()
+        log_exception("Simple structured JSON")
         return False
 
 
@@ -92,7 +314,7 @@ def test_complex_schema():
     print("\n=== Testing Complex Schema (ParsedCriteria) ===")
     
     try:
-        client = LlmClient()
+        client = get_llm_client()
         start_time = time.time()
         
         simple_criteria = """
@@ -108,12 +330,14 @@ def test_complex_schema():
         print(f"✅ Complex schema successful in {elapsed:.2f}s")
         print(f"Response type: {type(response)}")
         print(f"Criteria count: {len(response.criteria) if response.criteria else 0}")
+        if client.last_structured_retries:
+            print(f"Passed after {client.last_structured_retries} retries with validation feedback")
         return True
         
     except Exception as e:
         print(f"❌ Complex schema failed: {e}")
         print(f"Error type: {type(e).__name__}")
-        traceback.print_exc()
+        log_exception("Complex schema")
         return False
 
 
@@ -122,27 +346,38 @@ def test_jardiance_content():
     print("\n=== Testing Jardiance Content ===")
     
     try:
-        # Read the actual file
-        jardiance_path = Path("examples/jardiance_criteria.txt")
-        if not jardiance_path.exists():
+        if JARDIANCE_CONTENT is None:
             print("❌ Jardiance criteria file not found")
             return False
-            
-        with open(jardiance_path, 'r') as f:
-            content = f.read()
         
+        content = JARDIANCE_CONTENT
         print(f"Content length: {len(content)} characters")
         
-        client = LlmClient()
-        start_time = time.time()
+        client = get_llm_client()
+        
+        # Reject oversize input up front instead of waiting for a server-side error
+        token_count = count_prompt_tokens(client.model_name, content)
+        if token_count is not None:
+            print(f"Content tokens: {token_count}")
+            if token_count > MODEL_INPUT_TOKEN_LIMIT:
+                print(f"❌ Content exceeds the {MODEL_INPUT_TOKEN_LIMIT} token input limit")
+                return False
         
         # Test with progressively more complex operations
-        print("Testing basic text generation...")
-        response1 = client.generate_text(
-            prompt=f"Summarize these criteria in one sentence: {content[:500]}..."
+        print("Testing basic text generation (streamed)...")
+        response1, first_chunk1, elapsed1, completed1 = consume_text_stream(
+            client,
+            f"Summarize these criteria in one sentence: {content[:500]}...",
+            budget_seconds=client.config.timeout_seconds
         )
-        elapsed1 = time.time() - start_time
-        print(f"✅ Basic text generation: {elapsed1:.2f}s")
+        if first_chunk1 is None:
+            print(f"❌ Basic text generation produced no output after {elapsed1:.2f}s")
+            return False
+        if not completed1:
+            print(f"❌ Basic text generation exceeded the {client.config.timeout_seconds}s budget "
+                  f"(first chunk after {first_chunk1:.2f}s)")
+            return False
+        print(f"✅ Basic text generation: {elapsed1:.2f}s (first chunk after {first_chunk1:.2f}s)")
         
         print("Testing structured JSON with Jardiance content...")
         start_time2 = time.time()
@@ -162,11 +397,11 @@ def test_jardiance_content():
         print(f"Error type: {type(e).__name__}")
         if hasattr(e, 'response'):
             print(f"HTTP Response: {e.response}")
-        traceback.print_exc()
+        log_exception("Jardiance content")
         return False
 
 
-def test_model_variants():
+async def test_model_variants():
     """Test different model variants to see if specific model causes issues."""
     print("\n=== Testing Different Model Variants ===")
     
@@ -176,25 +411,35 @@ def test_model_variants():
         "gemini-2.5-pro-preview-06-05"
     ]
     
-    for model in models_to_test:
+    async def probe(client, model):
         print(f"\nTesting model: {model}")
         try:
-            load_dotenv()
-            client = genai.Client(api_key=os.getenv("GOOGLE_API_KEY"))
             start_time = time.time()
             
-            response = client.models.generate_content(
+            response = await client.aio.models.generate_content(
                 model=model,
                 contents="Respond with just 'Working' if you can process this."
             )
             
             elapsed = time.time() - start_time
             print(f"✅ {model}: {elapsed:.2f}s - {response.text}")
+            return True
             
         except Exception as e:
             print(f"❌ {model}: {e}")
             if hasattr(e, 'code'):
                 print(f"  Error code: {e.code}")
+            return False
+    
+    try:
+        client = get_genai_client(API_KEY)
+    except Exception as e:
+        print(f"❌ Could not create Gemini client: {e}")
+        return False
+    
+    # The probes are independent, so overlap their network latency
+    outcomes = await asyncio.gather(*(probe(client, model) for model in models_to_test))
+    return all(outcomes)
 
 
 def test_timeout_behavior():
@@ -202,54 +447,167 @@ def test_timeout_behavior():
     print("\n=== Testing Timeout Behavior ===")
     
     try:
-        client = LlmClient()
+        client = get_llm_client()
+        budget = client.config.timeout_seconds
         
         # Create a prompt that might take a long time
         long_prompt = """
         Please analyze this very long medical criteria document and extract every single criterion in extreme detail.
         """ + "Repeat this analysis multiple times to be absolutely thorough. " * 100
         
-        print("Testing with intentionally long/complex prompt...")
-        start_time = time.time()
+        token_count = count_prompt_tokens(client.model_name, long_prompt)
+        if token_count is not None and token_count > MODEL_INPUT_TOKEN_LIMIT:
+            print(f"⏭️  Skipping: prompt is {token_count} tokens, over the {MODEL_INPUT_TOKEN_LIMIT} token limit")
+            return SKIPPED
         
-        response = client.generate_text(prompt=long_prompt)
+        print(f"Testing with intentionally long/complex prompt (budget {budget}s)...")
+        response, first_chunk, elapsed, completed = consume_text_stream(client, long_prompt, budget)
+        
+        if first_chunk is None:
+            print(f"❌ No output within {elapsed:.2f}s - the request appears to hang")
+            return False
+        print(f"   First chunk after {first_chunk:.2f}s")
+        if not completed:
+            print(f"⚠️  Long prompt still streaming after {elapsed:.2f}s - cancelled (slow, not hung)")
+            print(f"Partial response length: {len(response)} characters")
+            return False
         
-        elapsed = time.time() - start_time
         print(f"✅ Long prompt completed in {elapsed:.2f}s")
         print(f"Response length: {len(response)} characters")
+        return True
         
     except Exception as e:
-        elapsed = time.time() - start_time
-        print(f"❌ Long prompt failed after {elapsed:.2f}s: {e}")
+        print(f"❌ Long prompt failed: {e}")
         print(f"Error type: {type(e).__name__}")
+        return False
 
 
-def test_rate_limits():
+async def test_rate_limits():
     """Test if we're hitting rate limits."""
     print("\n=== Testing Rate Limits ===")
     
+    request_count = 5
+    limiter = AsyncTokenBucket(rate=RATE_LIMIT_QPS)
+    
+    async def timed_request(client, i):
+        await limiter.acquire()
+        print(f"Request {i+1}/{request_count}...")
+        start_time = time.time()
+        
+        await asyncio.to_thread(client.generate_text, "Count to 10")
+        elapsed = time.time() - start_time
+        print(f"  ✅ Request {i+1}: {elapsed:.2f}s")
+    
     try:
-        client = LlmClient()
+        client = get_llm_client()
         
-        for i in range(5):
-            print(f"Request {i+1}/5...")
-            start_time = time.time()
-            
-            response = client.generate_text("Count to 10")
-            elapsed = time.time() - start_time
-            print(f"  ✅ Request {i+1}: {elapsed:.2f}s")
-            
-            # Small delay between requests
-            time.sleep(0.5)
+        # Fire every request at once; the bucket only delays them when it runs dry
+        await asyncio.gather(*(timed_request(client, i) for i in range(request_count)))
+        return True
             
     except Exception as e:
         print(f"❌ Rate limit test failed: {e}")
         if "quota" in str(e).lower() or "rate" in str(e).lower():
             print("🚨 This looks like a rate limiting issue!")
+        return False
+
+
+# Returned by a test that could not run, so it is reported neither as a pass nor a failure
+SKIPPED = "skipped"
 
 
-def main():
+@dataclass(slots=True)
+class TestResult:
+    """Outcome of one diagnostic test."""
+    name: str
+    passed: bool
+    elapsed: float
+    skipped: bool = False
+
+
+# Buffer collecting the output of the test running in the current context
+_TEST_OUTPUT: contextvars.ContextVar[Optional[io.StringIO]] = contextvars.ContextVar(
+    "test_output", default=None
+)
+
+
+class _PerTestStdout:
+    """
+    stdout stand-in that sends each test's prints to that test's own buffer.
+    
+    The buffer lives in a context variable, which asyncio tasks and
+    asyncio.to_thread both carry along, so concurrent tests never interleave.
+    Output from outside a test goes straight to the real stream.
+    """
+    
+    def __init__(self, stream):
+        self._stream = stream
+    
+    def write(self, text: str) -> int:
+        buffer = _TEST_OUTPUT.get()
+        return (buffer if buffer is not None else self._stream).write(text)
+    
+    def flush(self) -> None:
+        self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+async def _run_tests(concurrent_tests, sequential_tests) -> list:
+    """
+    Run the diagnostic tests, overlapping the independent ones.
+    
+    Every test is blocked on network I/O, so concurrent tests run together:
+    coroutine tests are awaited directly and synchronous ones are moved to
+    worker threads. The sequential tests measure latency and rate limits, so
+    they run one at a time afterwards, without the others loading the same key
+    and quota. Each test's output is buffered and printed as one block when
+    it finishes.
+    
+    Returns:
+        List of TestResult, concurrent tests first, each group in given order
+    """
+    async def run(test_func):
+        buffer = io.StringIO()
+        _TEST_OUTPUT.set(buffer)
+        start_time = time.time()
+        try:
+            if asyncio.iscoroutinefunction(test_func):
+                outcome = await test_func()
+            else:
+                outcome = await asyncio.to_thread(test_func)
+        except Exception as e:
+            print(f"\n💥 Test {test_func.__name__} crashed: {e}")
+            outcome = False
+        finally:
+            _TEST_OUTPUT.set(None)
+            print(buffer.getvalue(), end="", flush=True)
+        return TestResult(test_func.__name__, outcome is True, time.time() - start_time,
+                          skipped=outcome == SKIPPED)
+    
+    # gather runs each test in its own task, so each gets its own buffer
+    results = list(await asyncio.gather(*(run(test_func) for test_func in concurrent_tests)))
+    for test_func in sequential_tests:
+        results.append(await asyncio.create_task(run(test_func)))
+    return results
+
+
+def main(argv=None):
     """Run all diagnostic tests."""
+    global _CACHE
+
+    arg_parser = argparse.ArgumentParser(description="Gemini API diagnostic tests")
+    arg_parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help="Cache LLM responses in this directory (e.g. debug_outputs/llm_cache)",
+    )
+    args = arg_parser.parse_args(argv)
+    if args.cache_dir is not None:
+        _CACHE = ExtractionCache(args.cache_dir)
+
     print("🔍 Gemini API Diagnostic Tests")
     print("=" * 50)
     
@@ -264,41 +622,51 @@ def main():
         print(f"⚠️  Config error: {e}")
         print()
     
-    tests = [
+    concurrent_tests = [
         test_basic_api_connection,
         test_structured_json_simple,
         test_complex_schema,
         test_model_variants,
-        test_jardiance_content,
+        test_jardiance_content
+    ]
+    # Latency-sensitive probes run alone after the others
+    sequential_tests = [
         test_timeout_behavior,
         test_rate_limits
     ]
     
-    results = {}
-    
-    for test_func in tests:
-        try:
-            results[test_func.__name__] = test_func()
-        except KeyboardInterrupt:
-            print(f"\n🛑 Test {test_func.__name__} interrupted by user")
-            results[test_func.__name__] = False
-            break
-        except Exception as e:
-            print(f"\n💥 Test {test_func.__name__} crashed: {e}")
-            results[test_func.__name__] = False
+    try:
+        with contextlib.redirect_stdout(_PerTestStdout(sys.stdout)):
+            results = asyncio.run(_run_tests(concurrent_tests, sequential_tests))
+    except KeyboardInterrupt:
+        print("\n🛑 Tests interrupted by user")
+        results = [
+            TestResult(test_func.__name__, False, 0.0)
+            for test_func in concurrent_tests + sequential_tests
+        ]
     
     # Summary
     print("\n" + "=" * 50)
     print("🏁 Test Results Summary")
     print("=" * 50)
     
-    for test_name, passed in results.items():
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status} {test_name}")
+    passed_count = 0
+    skipped_count = 0
+    for result in results:
+        passed_count += result.passed
+        skipped_count += result.skipped
+        if result.skipped:
+            status = "⏭️  SKIP"
+        else:
+            status = "✅ PASS" if result.passed else "❌ FAIL"
+        print(f"{status} {result.name} ({result.elapsed:.2f}s)")
+    
+    total_count = len(results) - skipped_count
+    skipped_note = f" ({skipped_count} skipped)" if skipped_count else ""
+    print(f"\nOverall: {passed_count}/{total_count} tests passed{skipped_note}")
     
-    passed_count = sum(1 for result in results.values() if result is True)
-    total_count = len(results)
-    print(f"\nOverall: {passed_count}/{total_count} tests passed")
+    if _CACHE is not None:
+        print(f"LLM cache: {_CACHE.hits} hits, {_CACHE.misses} misses ({_CACHE.cache_dir})")
     
     if passed_count < total_count:
         print("\n🚨 Issues detected! Check the failing tests above for details.")
@@ -10,6 +10,8 @@ from src.demo.enhanced_visualizer import (
 )
 from rich.console import Console
 
+from enhanced_demo import EnhancedVisualPresenter
+
 def test_tree_renderer():
     """Test the Unicode tree renderer with sample data."""
     console = Console()
@@ -83,6 +85,19 @@ def test_processing_steps():
     for i, step in enumerate(steps):
         console.print(f"Step {i+1}: {step['agent_info']['name']} - {step['agent_info']['step']}")
 
+def test_enhanced_presenter_unicode_tree():
+    """Test that the presenter's Unicode tree renders every level of a nested tree."""
+    presenter = EnhancedVisualPresenter(Console())
+    tree_data = {}
+    presenter._simulate_tree_building(tree_data, 4)
+    
+    rendered = presenter._build_unicode_tree(tree_data["nodes"], highlight_node="prior_auth").plain
+    
+    assert "Error rendering tree" not in rendered
+    assert "│   ├── 🔥 Prior authorization required?" in rendered
+    assert "│   │   └── 🎯 APPROVE: No prior auth needed" in rendered
+    assert "    └── 🎯 DENY: Patient under 18" in rendered
+
 if __name__ == "__main__":
     test_tree_renderer()
     test_agent_renderer() 
@@ -1,4 +1,5 @@
 import pytest
+from unittest.mock import Mock, patch
 from pydantic import BaseModel
 
 # Define a simple Pydantic model for testing structured JSON generation
@@ -44,3 +45,43 @@ def test_generate_structured_json_with_system_instruction(llm_client):
     assert response.name == "Bob"
     assert response.age == 25
     assert response.is_student is False
+
+
+def test_generate_text_stream_yields_chunks(llm_client):
+    """Tests that generate_text_stream yields non-empty chunks in order."""
+    chunks = [Mock(text="Par"), Mock(text=None), Mock(text="is")]
+    with patch.object(llm_client.client.models, 'generate_content_stream', return_value=iter(chunks)):
+        assert list(llm_client.generate_text_stream("What is the capital of France?")) == ["Par", "is"]
+
+
+def test_generate_structured_json_retries_with_feedback(llm_client):
+    """Tests that schema validation failures are retried with the error fed back."""
+    invalid = Mock(parsed=None, text='{"name": "Alice"}')
+    valid = Mock(parsed=TestResponseSchema(name="Alice", age=30, is_student=True))
+    with patch.object(llm_client, '_generate_with_fallback', side_effect=[invalid, valid]) as mock_generate, \
+            patch('src.core.llm_client.time.sleep'):
+        response = llm_client.generate_structured_json("Describe Alice", TestResponseSchema)
+    
+    assert response.name == "Alice"
+    assert llm_client.last_structured_retries == 1
+    retry_prompt = mock_generate.call_args_list[1].kwargs['contents']
+    assert retry_prompt.startswith("Describe Alice")
+    assert "previous output had this error" in retry_prompt
+
+
+def test_generate_structured_json_gives_up_after_max_retries(llm_client):
+    """Tests that persistent invalid output raises after the configured retries."""
+    invalid = Mock(parsed=None, text='not json')
+    with patch.object(llm_client, '_generate_with_fallback', return_value=invalid) as mock_generate, \
+            patch('src.core.llm_client.time.sleep'):
+        with pytest.raises(ValueError, match="Failed to generate valid JSON"):
+            llm_client.generate_structured_json("Describe Alice", TestResponseSchema)
+    
+    assert mock_generate.call_count == llm_client.config.structured_json_max_retries + 1
+
+
+def test_clients_share_sdk_connection_pool(llm_client):
+    """Tests that LlmClients with the same API key reuse one SDK client."""
+    from src.core.llm_client import LlmClient
+    
+    assert LlmClient().client is llm_client.client